@@ -1,7 +1,13 @@
 import json
+import os
 import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import partial
+from functools import lru_cache, partial
+from queue import Queue
 from typing import Callable, List, Optional, Tuple, Union
 
 import cv2
@@ -15,17 +21,39 @@ from inference.core.interfaces.camera.entities import VideoFrame
 from inference.core.interfaces.stream.entities import SinkHandler
 from inference.core.interfaces.stream.utils import wrap_in_list
 from inference.core.utils.drawing import create_tiles
-from inference.core.utils.preprocess import letterbox_image
+from inference.core.utils.preprocess import (
+    get_size_keeping_aspect_ratio,
+    letterbox_image,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 DEFAULT_BBOX_ANNOTATOR = sv.BoundingBoxAnnotator()
 DEFAULT_LABEL_ANNOTATOR = sv.LabelAnnotator()
 DEFAULT_FPS_MONITOR = sv.FPSMonitor()
+UDP_SOCKET_SEND_BUFFER_SIZE = 1 << 20
+STATISTICS_FONT_SCALE = 0.8
+STATISTICS_TEXT_THICKNESS = 2
+STATISTICS_TEXT_COLOR = (0, 255, 0)
+STATISTICS_GLYPH_ASCENT = 30
+STATISTICS_GLYPH_DESCENT = 10
+STATISTICS_GLYPH_PADDING = 4
+VIDEO_FILE_SINK_QUEUE_SIZE = 16
+RENDERING_PARALLELISM_THRESHOLD = 2
 
 ImageWithSourceID = Tuple[Optional[int], np.ndarray]
 
+_ANNOTATION_BUFFERS = threading.local()
+_BLANK_FRAME = np.zeros((256, 256, 3), dtype=np.uint8)
+_BLANK_FRAME.setflags(write=False)
+_RENDERING_THREAD_POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
 
 def display_image(image: Union[ImageWithSourceID, List[ImageWithSourceID]]) -> None:
-    if issubclass(type(image), list):
+    if isinstance(image, list):
         tiles = create_tiles(images=[i[1] for i in image])
         cv2.imshow("Predictions - tiles", tiles)
     else:
@@ -59,7 +87,14 @@ def render_boxes(
     although predictions will not be displayed).
 
     Since version `0.9.18`, when multi-source InferencePipeline was introduced - it support batch input, without
-    changes to old functionality when single (predictions, video_frame) is used.
+    changes to old functionality when single (predictions, video_frame) is used. Batches of more than two frames
+    are rendered in parallel, unless custom `annotator` is given - those are always called sequentially, in order
+    of frames, as they may keep state between calls.
+
+    When `display_size` is set and predictions do not carry masks, boxes and labels are drawn on the already
+    resized image rather than on the full-resolution frame. As a result, line thickness and label size are
+    applied in output resolution - for sources larger than `display_size` annotations appear thicker relative
+    to the image than they used to. Configure `annotator` with smaller thickness / text scale if needed.
 
     Args:
         predictions (Union[dict, List[Optional[dict]]]): Roboflow predictions, the function support single prediction
@@ -117,6 +152,9 @@ def render_boxes(
         sequential_input_provided = True
     video_frame = wrap_in_list(element=video_frame)
     predictions = wrap_in_list(element=predictions)
+    # default annotators are stateless - custom ones (for instance sv.TraceAnnotator) may keep
+    # state across frames, so they must not be called concurrently nor out of order
+    default_annotators_used = annotator is None
     if annotator is None:
         annotator = [
             DEFAULT_BBOX_ANNOTATOR,
@@ -124,33 +162,56 @@ def render_boxes(
         ]
     fps_value = None
     if fps_monitor is not None:
-        ticks = sum(f is not None for f in video_frame)
-        for _ in range(ticks):
-            fps_monitor.tick()
+        _tick_fps_monitor(
+            fps_monitor=fps_monitor,
+            ticks=sum(f is not None for f in video_frame),
+        )
         if hasattr(fps_monitor, "fps"):
             fps_value = fps_monitor.fps
         else:
             fps_value = fps_monitor()
-    images: List[ImageWithSourceID] = []
     annotators = annotator if isinstance(annotator, list) else [annotator]
-    for idx, (single_frame, frame_prediction) in enumerate(
-        zip(video_frame, predictions)
-    ):
-        image = _handle_frame_rendering(
-            frame=single_frame,
-            prediction=frame_prediction,
-            annotators=annotators,
-            display_size=display_size,
-            display_statistics=display_statistics,
-            fps_value=fps_value,
+    render_in_parallel = (
+        default_annotators_used and len(video_frame) > RENDERING_PARALLELISM_THRESHOLD
+    )
+    render_frame = partial(
+        _handle_frame_rendering,
+        annotators=annotators,
+        display_size=display_size,
+        display_statistics=display_statistics,
+        fps_value=fps_value,
+        # pool threads pick up arbitrary sources - reusing per-thread buffers there would
+        # retain full-resolution copy of each source in each of the workers
+        reuse_buffer=not render_in_parallel,
+    )
+    if render_in_parallel:
+        # OpenCV releases GIL while processing images, so frames from multiple sources
+        # can be rendered in parallel
+        rendered_images = list(
+            _RENDERING_THREAD_POOL.map(render_frame, video_frame, predictions)
         )
-        images.append((idx, image))
+    else:
+        rendered_images = list(map(render_frame, video_frame, predictions))
+    images: List[ImageWithSourceID] = list(enumerate(rendered_images))
     if sequential_input_provided:
         on_frame_rendered((video_frame[0].source_id, images[0][1]))
     else:
         on_frame_rendered(images)
 
 
+def _tick_fps_monitor(fps_monitor: sv.FPSMonitor, ticks: int) -> None:
+    timestamps = getattr(fps_monitor, "all_timestamps", None)
+    if type(fps_monitor).tick is not sv.FPSMonitor.tick or not isinstance(
+        timestamps, deque
+    ):
+        for _ in range(ticks):
+            fps_monitor.tick()
+        return None
+    # all frames of the batch are registered at once - equivalent to what
+    # sv.FPSMonitor.tick() does for single frame
+    timestamps.extend([time.monotonic()] * ticks)
+
+
 def _handle_frame_rendering(
     frame: Optional[VideoFrame],
     prediction: dict,
@@ -158,34 +219,21 @@ def _handle_frame_rendering(
     display_size: Optional[Tuple[int, int]],
     display_statistics: bool,
     fps_value: Optional[float],
+    reuse_buffer: bool = True,
 ) -> np.ndarray:
     if frame is None:
-        image = np.zeros((256, 256, 3), dtype=np.uint8)
+        if display_size is not None:
+            image = letterbox_image(_BLANK_FRAME, desired_size=display_size)
+        else:
+            image = _BLANK_FRAME.copy()
     else:
-        try:
-            labels = [p["class"] for p in prediction["predictions"]]
-            if hasattr(sv.Detections, "from_inference"):
-                detections = sv.Detections.from_inference(prediction)
-            else:
-                detections = sv.Detections.from_inference(prediction)
-            image = frame.image.copy()
-            for annotator in annotators:
-                kwargs = {
-                    "scene": image,
-                    "detections": detections,
-                }
-                if isinstance(annotator, sv.LabelAnnotator):
-                    kwargs["labels"] = labels
-                image = annotator.annotate(**kwargs)
-        except (TypeError, KeyError):
-            logger.warning(
-                f"Used `render_boxes(...)` sink, but predictions that were provided do not match the expected "
-                f"format of object detection prediction that could be accepted by "
-                f"`supervision.Detection.from_inference(...)"
-            )
-            image = frame.image.copy()
-    if display_size is not None:
-        image = letterbox_image(image, desired_size=display_size)
+        image = _render_frame(
+            frame=frame,
+            prediction=prediction,
+            annotators=annotators,
+            display_size=display_size,
+            reuse_buffer=reuse_buffer,
+        )
     if display_statistics:
         image = render_statistics(
             image=image,
@@ -195,35 +243,202 @@ def _handle_frame_rendering(
     return image
 
 
+def _render_frame(
+    frame: VideoFrame,
+    prediction: dict,
+    annotators: List[BaseAnnotator],
+    display_size: Optional[Tuple[int, int]],
+    reuse_buffer: bool = True,
+) -> np.ndarray:
+    letterboxed = False
+    try:
+        if len(prediction["predictions"]) == 0:
+            # nothing to draw - skipping detections parsing and annotation
+            if display_size is not None:
+                return letterbox_image(frame.image, desired_size=display_size)
+            return frame.image.copy()
+        labels = [p["class"] for p in prediction["predictions"]]
+        if hasattr(sv.Detections, "from_inference"):
+            detections = sv.Detections.from_inference(prediction)
+        else:
+            detections = sv.Detections.from_inference(prediction)
+        if display_size is not None and detections.mask is None:
+            # boxes are drawn directly on the (smaller) letterboxed image, rather than on
+            # full-resolution frame which would be downscaled afterwards
+            image = letterbox_image(frame.image, desired_size=display_size)
+            detections.xyxy = _project_boxes_onto_letterboxed_image(
+                xyxy=detections.xyxy,
+                image_size=(frame.image.shape[1], frame.image.shape[0]),
+                desired_size=display_size,
+            )
+            letterboxed = True
+        else:
+            image = _get_annotation_canvas(
+                frame=frame,
+                reuse_buffer=reuse_buffer and display_size is not None,
+            )
+        for annotator in annotators:
+            kwargs = {
+                "scene": image,
+                "detections": detections,
+            }
+            if isinstance(annotator, sv.LabelAnnotator):
+                kwargs["labels"] = labels
+            image = annotator.annotate(**kwargs)
+    except (TypeError, KeyError):
+        logger.warning(
+            f"Used `render_boxes(...)` sink, but predictions that were provided do not match the expected "
+            f"format of object detection prediction that could be accepted by "
+            f"`supervision.Detection.from_inference(...)"
+        )
+        image = frame.image if display_size is not None else frame.image.copy()
+        letterboxed = False
+    if display_size is not None and not letterboxed:
+        image = letterbox_image(image, desired_size=display_size)
+    return image
+
+
+def _project_boxes_onto_letterboxed_image(
+    xyxy: np.ndarray,
+    image_size: Tuple[int, int],
+    desired_size: Tuple[int, int],
+) -> np.ndarray:
+    new_width, new_height = get_size_keeping_aspect_ratio(
+        image_size=image_size,
+        desired_size=desired_size,
+    )
+    scale_x, scale_y = new_width / image_size[0], new_height / image_size[1]
+    left_padding = (desired_size[0] - new_width) // 2
+    top_padding = (desired_size[1] - new_height) // 2
+    return xyxy * np.array([scale_x, scale_y, scale_x, scale_y]) + np.array(
+        [left_padding, top_padding, left_padding, top_padding]
+    )
+
+
+def _get_annotation_canvas(frame: VideoFrame, reuse_buffer: bool) -> np.ndarray:
+    # When output is letterboxed, annotated image never leaves the sink (letterboxing allocates
+    # new array) - so per-source buffer can be reused instead of allocating full-resolution copy
+    # of each frame. Buffers are kept per thread, as sinks may be used by multiple pipelines.
+    if not reuse_buffer:
+        return frame.image.copy()
+    buffers = getattr(_ANNOTATION_BUFFERS, "buffers", None)
+    if buffers is None:
+        buffers = {}
+        _ANNOTATION_BUFFERS.buffers = buffers
+    buffer = buffers.get(frame.source_id)
+    if (
+        buffer is None
+        or buffer.shape != frame.image.shape
+        or buffer.dtype != frame.image.dtype
+    ):
+        buffer = np.empty_like(frame.image)
+        buffers[frame.source_id] = buffer
+    np.copyto(buffer, frame.image)
+    return buffer
+
+
 def render_statistics(
     image: np.ndarray, frame_timestamp: Optional[datetime], fps: Optional[float]
 ) -> np.ndarray:
-    image_height = image.shape[0]
+    throughput_text, latency_text = None, None
     if frame_timestamp is not None:
         latency = round((datetime.now() - frame_timestamp).total_seconds() * 1000, 2)
-        image = cv2.putText(
-            image,
-            f"LATENCY: {latency} ms",
-            (10, image_height - 10),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (0, 255, 0),
-            2,
-        )
+        latency_text = f"LATENCY: {latency} ms"
     if fps is not None:
         fps = round(fps, 2)
-        image = cv2.putText(
-            image,
-            f"THROUGHPUT: {fps}",
-            (10, image_height - 50),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.8,
-            (0, 255, 0),
-            2,
-        )
+        throughput_text = f"THROUGHPUT: {fps}"
+    if latency_text is None and throughput_text is None:
+        return image
+    # both lines are composed into one small stripe, which is then painted into the
+    # bottom-left corner of the frame at once
+    stripe_mask = _compose_statistics_stripe(lines=[throughput_text, latency_text])
+    _paint_mask(
+        image=image,
+        mask=stripe_mask,
+        left=10 - STATISTICS_GLYPH_PADDING,
+        top=image.shape[0] - stripe_mask.shape[0],
+        color=_get_statistics_text_color(image=image),
+    )
     return image
 
 
+def _compose_statistics_stripe(lines: List[Optional[str]]) -> np.ndarray:
+    # glyphs are rasterised once per character, so composing text out of them is much
+    # cheaper than cv2.putText(...) rasterising whole strings for each frame
+    line_height = STATISTICS_GLYPH_ASCENT + STATISTICS_GLYPH_DESCENT
+    lines_glyphs = [
+        [_rasterise_statistics_glyph(character=character) for character in line or ""]
+        for line in lines
+    ]
+    width = max(
+        sum(glyph_mask.shape[1] for glyph_mask, _ in line_glyphs)
+        for line_glyphs in lines_glyphs
+    )
+    stripe_mask = np.zeros((line_height * len(lines), width), dtype=bool)
+    for line_index, line_glyphs in enumerate(lines_glyphs):
+        top, x = line_index * line_height, 0
+        for glyph_mask, advance in line_glyphs:
+            glyph_width = glyph_mask.shape[1]
+            stripe_mask[top : top + line_height, x : x + glyph_width] |= glyph_mask
+            x += advance
+    return stripe_mask
+
+
+@lru_cache(maxsize=128)
+def _rasterise_statistics_glyph(character: str) -> Tuple[np.ndarray, int]:
+    (width, _), _ = cv2.getTextSize(
+        character,
+        cv2.FONT_HERSHEY_SIMPLEX,
+        STATISTICS_FONT_SCALE,
+        STATISTICS_TEXT_THICKNESS,
+    )
+    canvas = np.zeros(
+        (
+            STATISTICS_GLYPH_ASCENT + STATISTICS_GLYPH_DESCENT,
+            width + 2 * STATISTICS_GLYPH_PADDING,
+        ),
+        dtype=np.uint8,
+    )
+    cv2.putText(
+        canvas,
+        character,
+        (STATISTICS_GLYPH_PADDING, STATISTICS_GLYPH_ASCENT),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        STATISTICS_FONT_SCALE,
+        255,
+        STATISTICS_TEXT_THICKNESS,
+    )
+    glyph_mask = canvas > 0
+    glyph_mask.setflags(write=False)
+    # text size accounts for stroke thickness, which does not advance the pen
+    return glyph_mask, width - STATISTICS_TEXT_THICKNESS
+
+
+def _get_statistics_text_color(image: np.ndarray) -> Union[int, Tuple[int, ...]]:
+    # as in cv2.putText(...) - colour components beyond image channels are ignored
+    if image.ndim == 2:
+        return STATISTICS_TEXT_COLOR[0]
+    channels = image.shape[2]
+    return (STATISTICS_TEXT_COLOR + (0,) * channels)[:channels]
+
+
+def _paint_mask(
+    image: np.ndarray,
+    mask: np.ndarray,
+    left: int,
+    top: int,
+    color: Union[int, Tuple[int, ...]],
+) -> None:
+    image_height, image_width = image.shape[:2]
+    x_min, y_min = max(left, 0), max(top, 0)
+    x_max = min(left + mask.shape[1], image_width)
+    y_max = min(top + mask.shape[0], image_height)
+    if x_max <= x_min or y_max <= y_min:
+        return None
+    region = image[y_min:y_max, x_min:x_max]
+    region[mask[y_min - top : y_max - top, x_min - left : x_max - left]] = color
+
+
 class UDPSink:
     @classmethod
     def init(cls, ip_address: str, port: int) -> "UDPSink":
@@ -242,7 +457,9 @@ class UDPSink:
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1)
-        udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        udp_socket.setsockopt(
+            socket.SOL_SOCKET, socket.SO_SNDBUF, UDP_SOCKET_SEND_BUFFER_SIZE
+        )
         return cls(
             ip_address=ip_address,
             port=port,
@@ -253,6 +470,7 @@ class UDPSink:
         self._ip_address = ip_address
         self._port = port
         self._socket = udp_socket
+        self._destination = (ip_address, port)
 
     def send_predictions(
         self,
@@ -297,6 +515,8 @@ class UDPSink:
         """
         video_frame = wrap_in_list(element=video_frame)
         predictions = wrap_in_list(element=predictions)
+        emission_time = datetime.now().isoformat()
+        payloads = []
         for single_frame, frame_predictions in zip(video_frame, predictions):
             if single_frame is None:
                 continue
@@ -304,17 +524,27 @@ class UDPSink:
                 "source_id": single_frame.source_id,
                 "frame_id": single_frame.frame_id,
                 "frame_decoding_time": single_frame.frame_timestamp.isoformat(),
-                "emission_time": datetime.now().isoformat(),
+                "emission_time": emission_time,
             }
             frame_predictions["inference_metadata"] = inference_metadata
-            serialised_predictions = json.dumps(frame_predictions).encode("utf-8")
-            self._socket.sendto(
-                serialised_predictions,
-                (
-                    self._ip_address,
-                    self._port,
-                ),
-            )
+            payloads.append(_serialise_predictions(predictions=frame_predictions))
+        self._send_payloads(payloads=payloads)
+
+    def _send_payloads(self, payloads: List[bytes]) -> None:
+        # serialisation is done upfront, such that datagrams of the whole batch are emitted
+        # back-to-back without Python-level work in between sendto() calls
+        send_to, destination = self._socket.sendto, self._destination
+        for payload in payloads:
+            send_to(payload, destination)
+
+
+def _serialise_predictions(predictions: dict) -> bytes:
+    if orjson is None:
+        return json.dumps(predictions).encode("utf-8")
+    return orjson.dumps(
+        predictions,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
 
 
 def multi_sink(
@@ -393,11 +623,15 @@ def active_learning_sink(
     """
     video_frame = wrap_in_list(element=video_frame)
     predictions = wrap_in_list(element=predictions)
-    images = [f.image for f in video_frame if f is not None]
-    predictions = [p for p in predictions if p is not None]
+    images, frames_predictions = [], []
+    for single_frame, frame_prediction in zip(video_frame, predictions):
+        if single_frame is None or frame_prediction is None:
+            continue
+        images.append(single_frame.image)
+        frames_predictions.append(frame_prediction)
     active_learning_middleware.register_batch(
         inference_inputs=images,
-        predictions=predictions,
+        predictions=frames_predictions,
         prediction_type=model_type,
         disable_preproc_auto_orient=disable_preproc_auto_orient,
     )
@@ -428,7 +662,7 @@ class VideoFileSink:
             display_size (Tuple[int, int]): tuple in format (width, height) to resize visualisation output. Should
                 be set to the same value as `display_size` for InferencePipeline with single video source, otherwise
                 it represents the size of single visualisation tile (whole tiles mosaic will be scaled to
-                `video_frame_size`)
+                `video_frame_size`). Annotations are drawn in that resolution - see `render_boxes(...)`.
             fps_monitor (Optional[sv.FPSMonitor]): FPS monitor used to monitor throughput
             display_statistics (bool): Flag to decide if throughput and latency can be displayed in the result image,
                 if enabled, throughput will only be presented if `fps_monitor` is not None
@@ -493,6 +727,8 @@ class VideoFileSink:
         self._frame_idx = 0
         self._video_frame_size = video_frame_size
         self._video_writer: Optional[cv2.VideoWriter] = None
+        self._frames_queue: Queue = Queue(maxsize=VIDEO_FILE_SINK_QUEUE_SIZE)
+        self._writer_thread: Optional[threading.Thread] = None
         self.on_prediction = partial(
             render_boxes,
             annotator=self._annotator,
@@ -504,8 +740,11 @@ class VideoFileSink:
 
     def release(self) -> None:
         """
-        Releases VideoWriter object.
+        Waits until all frames are saved and releases VideoWriter object.
         """
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self._frames_queue.put(None)
+            self._writer_thread.join()
         if self._video_writer is not None and self._video_writer.isOpened():
             self._video_writer.release()
 
@@ -515,27 +754,80 @@ class VideoFileSink:
     ) -> None:
         if self._video_writer is None:
             self._initialise_sink()
-        if issubclass(type(frame), list):
+        if isinstance(frame, list):
             frame = create_tiles(images=[i[1] for i in frame])
         else:
             frame = frame[1]
         if (frame.shape[1], frame.shape[0]) != self._video_frame_size:
             frame = letterbox_image(image=frame, desired_size=self._video_frame_size)
-        self._video_writer.write(frame)
+        if not self._writer_thread.is_alive():
+            # sink was released - frames are not saved, as VideoWriter is closed
+            return None
+        # encoding and disk I/O happen in writer thread, bounded queue applies
+        # back-pressure to the pipeline once the writer cannot keep up
+        self._frames_queue.put(frame)
         if not self._quiet:
             print(f"Writing frame {self._frame_idx}", end="\r")
         self._frame_idx += 1
 
     def _initialise_sink(self) -> None:
-        self._video_writer = cv2.VideoWriter(
-            self._video_file_name,
-            cv2.VideoWriter_fourcc(*"MJPG"),
-            self._output_fps,
-            self._video_frame_size,
+        self._video_writer = _open_video_writer(
+            video_file_name=self._video_file_name,
+            fourcc=cv2.VideoWriter_fourcc(*"MJPG"),
+            output_fps=self._output_fps,
+            video_frame_size=self._video_frame_size,
         )
+        self._writer_thread = threading.Thread(target=self._write_frames, daemon=True)
+        self._writer_thread.start()
+
+    def _write_frames(self) -> None:
+        while True:
+            frame: Optional[np.ndarray] = self._frames_queue.get()
+            if frame is None:
+                break
+            try:
+                self._video_writer.write(frame)
+            except Exception as error:
+                logger.error(
+                    f"Could not write frame into {self._video_file_name} due to error: {error}."
+                )
 
     def __enter__(self) -> "VideoFileSink":
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.release()
+
+
+def _open_video_writer(
+    video_file_name: str,
+    fourcc: int,
+    output_fps: int,
+    video_frame_size: Tuple[int, int],
+) -> cv2.VideoWriter:
+    if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+        # hardware encoding is requested if backend supports it - OpenCV falls back to
+        # software encoder when no accelerator is available
+        video_writer = cv2.VideoWriter(
+            video_file_name,
+            cv2.CAP_ANY,
+            fourcc,
+            output_fps,
+            video_frame_size,
+            [
+                cv2.VIDEOWRITER_PROP_HW_ACCELERATION,
+                cv2.VIDEO_ACCELERATION_ANY,
+            ],
+        )
+        if video_writer.isOpened():
+            return video_writer
+        logger.debug(
+            "Could not open VideoWriter with hardware acceleration params - "
+            "falling back to default configuration."
+        )
+    return cv2.VideoWriter(
+        video_file_name,
+        fourcc,
+        output_fps,
+        video_frame_size,
+    )
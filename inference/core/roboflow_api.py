@@ -338,7 +338,7 @@ def annotate_image_at_roboflow(
     dataset_id: DatasetID,
     local_image_id: str,
     roboflow_image_id: str,
-    annotation_content: str,
+    annotation_content: Union[str, bytes],
     annotation_file_type: str,
     is_prediction: bool = True,
 ) -> dict:
@@ -195,6 +195,9 @@ def letterbox_image(
     bottom_padding = desired_size[1] - new_height - top_padding
     left_padding = (desired_size[0] - new_width) // 2
     right_padding = desired_size[0] - new_width - left_padding
+    if top_padding == bottom_padding == left_padding == right_padding == 0:
+        # aspect ratio already matches - resized image is a new array, no padding needed
+        return resized_img
     return cv2.copyMakeBorder(
         resized_img,
         top_padding,
@@ -212,12 +215,15 @@ def downscale_image_keeping_aspect_ratio(
 ) -> np.ndarray:
     if image.shape[0] <= desired_size[1] and image.shape[1] <= desired_size[0]:
         return image
-    return resize_image_keeping_aspect_ratio(image=image, desired_size=desired_size)
+    return resize_image_keeping_aspect_ratio(
+        image=image, desired_size=desired_size, interpolation=cv2.INTER_AREA
+    )
 
 
 def resize_image_keeping_aspect_ratio(
     image: np.ndarray,
     desired_size: Tuple[int, int],
+    interpolation: int = cv2.INTER_LINEAR,
 ) -> np.ndarray:
     """
     Resize reserving its aspect ratio.
@@ -225,8 +231,31 @@ def resize_image_keeping_aspect_ratio(
     Parameters:
     - image: numpy array representing the image.
     - desired_size: tuple (width, height) representing the target dimensions.
+    - interpolation: OpenCV interpolation flag used for resizing.
+    """
+    new_size = get_size_keeping_aspect_ratio(
+        image_size=(image.shape[1], image.shape[0]),
+        desired_size=desired_size,
+    )
+    # Resize the image to new dimensions
+    return cv2.resize(image, new_size, interpolation=interpolation)
+
+
+def get_size_keeping_aspect_ratio(
+    image_size: Tuple[int, int],
+    desired_size: Tuple[int, int],
+) -> Tuple[int, int]:
+    """
+    Calculate size of image fitted into desired size, preserving its aspect ratio.
+
+    Parameters:
+    - image_size: tuple (width, height) representing the image dimensions.
+    - desired_size: tuple (width, height) representing the target dimensions.
+
+    Returns:
+    - tuple (width, height) of resized image.
     """
-    img_ratio = image.shape[1] / image.shape[0]
+    img_ratio = image_size[0] / image_size[1]
     desired_ratio = desired_size[0] / desired_size[1]
 
     # Determine the new dimensions
@@ -238,6 +267,4 @@ def resize_image_keeping_aspect_ratio(
         # Resize by height
         new_height = desired_size[1]
         new_width = int(desired_size[1] * img_ratio)
-
-    # Resize the image to new dimensions
-    return cv2.resize(image, (new_width, new_height))
+    return new_width, new_height
@@ -28,22 +28,38 @@ from inference.core.workflows.execution_engine.entities.base import WorkflowImag
 
 def serialise_sv_detections(detections: sv.Detections) -> dict:
     serialized_detections = []
-    image_dimensions = None
-    for xyxy, mask, confidence, class_id, tracker_id, data in detections:
-        detection_dict = {}
-        image_dimensions = data.get(IMAGE_DIMENSIONS_KEY)
-        if isinstance(xyxy, np.ndarray):
-            xyxy = xyxy.astype(float).tolist()
-        x1, y1, x2, y2 = xyxy
-        detection_dict[WIDTH_KEY] = abs(x2 - x1)
-        detection_dict[HEIGHT_KEY] = abs(y2 - y1)
-        detection_dict[X_KEY] = x1 + detection_dict[WIDTH_KEY] / 2
-        detection_dict[Y_KEY] = y1 + detection_dict[HEIGHT_KEY] / 2
-
+    data = detections.data
+    # iterating over sv.Detections builds a dict with all `data` fields for every
+    # row - columns are indexed directly and box geometry is computed at once
+    xyxy = detections.xyxy.astype(float)
+    widths = np.abs(xyxy[:, 2] - xyxy[:, 0])
+    heights = np.abs(xyxy[:, 3] - xyxy[:, 1])
+    centers_x = xyxy[:, 0] + widths / 2
+    centers_y = xyxy[:, 1] + heights / 2
+    has_keypoints = (
+        KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS in data
+        and KEYPOINTS_XY_KEY_IN_SV_DETECTIONS in data
+    )
+    boxes = zip(
+        widths.tolist(), heights.tolist(), centers_x.tolist(), centers_y.tolist()
+    )
+    for i, (width, height, x_center, y_center) in enumerate(boxes):
+        detection_dict = {
+            WIDTH_KEY: width,
+            HEIGHT_KEY: height,
+            X_KEY: x_center,
+            Y_KEY: y_center,
+        }
+        confidence = (
+            detections.confidence[i] if detections.confidence is not None else None
+        )
+        class_id = detections.class_id[i] if detections.class_id is not None else None
         detection_dict[CONFIDENCE_KEY] = float(confidence)
         detection_dict[CLASS_ID_KEY] = int(class_id)
-        if mask is not None:
-            polygon = sv.mask_to_polygons(mask=mask)
+        if detections.mask is not None:
+            polygon = sv.mask_to_polygons(mask=detections.mask[i])
             detection_dict[POLYGON_KEY] = []
             for x, y in polygon[0]:
                 detection_dict[POLYGON_KEY].append(
@@ -52,22 +68,17 @@ def serialise_sv_detections(detections: sv.Detections) -> dict:
                         Y_KEY: float(y),
                     }
                 )
-        if tracker_id is not None:
-            detection_dict[TRACKER_ID_KEY] = int(tracker_id)
-        detection_dict[CLASS_NAME_KEY] = str(data["class_name"])
-        detection_dict[DETECTION_ID_KEY] = str(data[DETECTION_ID_KEY])
+        if detections.tracker_id is not None:
+            detection_dict[TRACKER_ID_KEY] = int(detections.tracker_id[i])
+        detection_dict[CLASS_NAME_KEY] = str(data["class_name"][i])
+        detection_dict[DETECTION_ID_KEY] = str(data[DETECTION_ID_KEY][i])
         if PARENT_ID_KEY in data:
-            detection_dict[PARENT_ID_KEY] = str(data[PARENT_ID_KEY])
-        if (
-            KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS in data
-            and KEYPOINTS_XY_KEY_IN_SV_DETECTIONS in data
-        ):
-            kp_class_id = data[KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS]
-            kp_class_name = data[KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS]
-            kp_confidence = data[KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS]
-            kp_xy = data[KEYPOINTS_XY_KEY_IN_SV_DETECTIONS]
+            detection_dict[PARENT_ID_KEY] = str(data[PARENT_ID_KEY][i])
+        if has_keypoints:
+            kp_class_id = data[KEYPOINTS_CLASS_ID_KEY_IN_SV_DETECTIONS][i]
+            kp_class_name = data[KEYPOINTS_CLASS_NAME_KEY_IN_SV_DETECTIONS][i]
+            kp_confidence = data[KEYPOINTS_CONFIDENCE_KEY_IN_SV_DETECTIONS][i]
+            kp_xy = data[KEYPOINTS_XY_KEY_IN_SV_DETECTIONS][i]
             detection_dict[KEYPOINTS_KEY_IN_INFERENCE_RESPONSE] = []
             for (
                 keypoint_class_id,
@@ -85,7 +96,7 @@ def serialise_sv_detections(detections: sv.Detections) -> dict:
                     }
                 )
         if DETECTED_CODE_KEY in data:
-            detection_dict[DETECTED_CODE_KEY] = data[DETECTED_CODE_KEY]
+            detection_dict[DETECTED_CODE_KEY] = data[DETECTED_CODE_KEY][i]
         serialized_detections.append(detection_dict)
     image_metadata = {
         "width": None,
@@ -93,7 +104,8 @@ def serialise_sv_detections(detections: sv.Detections) -> dict:
     }  # TODO: this breaks the contract of
     # standard inference, but to fix that problem, we would need sv.Detections to provide
     # detection-level metadata.
-    if image_dimensions is not None:
+    if serialized_detections and IMAGE_DIMENSIONS_KEY in data:
+        image_dimensions = data[IMAGE_DIMENSIONS_KEY][-1]
         image_metadata = {
             "width": image_dimensions[1].item(),
             "height": image_dimensions[0].item(),
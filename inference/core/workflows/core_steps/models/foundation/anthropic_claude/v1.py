@@ -1,7 +1,7 @@
 import base64
 import json
 import re
-from functools import partial
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Literal, Optional, Tuple, Type, Union
 
 import anthropic
@@ -370,7 +370,7 @@ def execute_claude_request(
     temperature: Optional[float],
     api_key: str,
 ) -> str:
-    client = anthropic.Anthropic(api_key=api_key)
+    client = _get_anthropic_client(api_key=api_key)
     if system_prompt is None:
         system_prompt = NOT_GIVEN
     if temperature is None:
@@ -385,6 +385,13 @@ def execute_claude_request(
     return result.content[0].text
 
 
+@lru_cache(maxsize=16)
+def _get_anthropic_client(api_key: str) -> anthropic.Anthropic:
+    # client is reused across requests (and threads), such that its HTTP connections
+    # pool is kept alive instead of establishing new connection for each request
+    return anthropic.Anthropic(api_key=api_key)
+
+
 def prepare_unconstrained_prompt(
     base64_image: str,
     prompt: str,
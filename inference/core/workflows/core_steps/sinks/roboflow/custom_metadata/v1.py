@@ -1,7 +1,7 @@
 import hashlib
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from functools import partial
+from functools import lru_cache, partial
 from typing import List, Literal, Optional, Tuple, Type, Union
 
 import numpy as np
@@ -171,8 +171,7 @@ def get_workspace_name(
     api_key: str,
     cache: BaseCache,
 ) -> str:
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cached_workspace_name = cache.get(cache_key)
     if cached_workspace_name:
         return cached_workspace_name
@@ -183,6 +182,12 @@ def get_workspace_name(
     return workspace_name_from_api
 
 
+@lru_cache(maxsize=256)
+def _get_workspace_name_cache_key(api_key: str) -> str:
+    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
+    return f"workflows:api_key_to_workspace:{api_key_hash}"
+
+
 def add_custom_metadata_request(
     cache: BaseCache,
     api_key: str,
@@ -20,8 +20,8 @@ import json
 import logging
 from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
-from functools import partial
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
 from typing import List, Literal, Optional, Tuple, Type, Union
 from uuid import uuid4
 
@@ -40,6 +40,7 @@ from inference.core.active_learning.entities import (
     StrategyLimitType,
 )
 from inference.core.cache.base import BaseCache
+from inference.core.env import WORKFLOWS_REMOTE_EXECUTION_MAX_STEP_CONCURRENT_REQUESTS
 from inference.core.roboflow_api import (
     annotate_image_at_roboflow,
     get_roboflow_workspace,
@@ -48,7 +49,10 @@ from inference.core.roboflow_api import (
 from inference.core.workflows.core_steps.common.serializers import (
     serialise_sv_detections,
 )
-from inference.core.workflows.core_steps.common.utils import scale_sv_detections
+from inference.core.workflows.core_steps.common.utils import (
+    run_in_parallel,
+    scale_sv_detections,
+)
 from inference.core.workflows.execution_engine.constants import INFERENCE_ID_KEY
 from inference.core.workflows.execution_engine.entities.base import (
     Batch,
@@ -75,6 +79,11 @@ from inference.core.workflows.prototypes.block import (
     WorkflowBlockManifest,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 SHORT_DESCRIPTION = "Save images and predictions in your Roboflow Dataset"
 
 LONG_DESCRIPTION = """
@@ -274,10 +283,21 @@ class RoboflowDatasetUploadBlockV1(WorkflowBlock):
                 }
                 for _ in range(len(images))
             ]
-        result = []
         predictions = [None] * len(images) if predictions is None else predictions
-        for image, prediction in zip(images, predictions):
-            error_status, message = register_datapoint_at_roboflow(
+        # the same datapoint may be referred multiple times in a batch (for instance
+        # as a result of broadcasting) - there is no point registering it again
+        datapoints_keys = [
+            (id(image), id(prediction))
+            for image, prediction in zip(images, predictions)
+        ]
+        registration_tasks = {}
+        for datapoint_key, image, prediction in zip(
+            datapoints_keys, images, predictions
+        ):
+            if datapoint_key in registration_tasks:
+                continue
+            registration_tasks[datapoint_key] = partial(
+                register_datapoint_at_roboflow,
                 image=image,
                 prediction=prediction,
                 target_project=target_project,
@@ -297,6 +317,21 @@ class RoboflowDatasetUploadBlockV1(WorkflowBlock):
                 thread_pool_executor=self._thread_pool_executor,
                 api_key=self._api_key,
             )
+        registration_runs_in_background = fire_and_forget and (
+            self._background_tasks or self._thread_pool_executor
+        )
+        if registration_runs_in_background:
+            # tasks only get enqueued - no point spinning up thread pool for that
+            outcomes = [task() for task in registration_tasks.values()]
+        else:
+            outcomes = run_in_parallel(
+                tasks=list(registration_tasks.values()),
+                max_workers=WORKFLOWS_REMOTE_EXECUTION_MAX_STEP_CONCURRENT_REQUESTS,
+            )
+        registration_results = dict(zip(registration_tasks.keys(), outcomes))
+        result = []
+        for datapoint_key in datapoints_keys:
+            error_status, message = registration_results[datapoint_key]
             result.append({"error_status": error_status, "message": message})
         return result
 
@@ -440,8 +475,7 @@ def get_workspace_name(
     api_key: str,
     cache: BaseCache,
 ) -> str:
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cached_workspace_name = cache.get(cache_key)
     if cached_workspace_name:
         return cached_workspace_name
@@ -452,30 +486,46 @@ def get_workspace_name(
     return workspace_name_from_api
 
 
+@lru_cache(maxsize=256)
+def _get_workspace_name_cache_key(api_key: str) -> str:
+    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
+    return f"workflows:api_key_to_workspace:{api_key_hash}"
+
+
 def generate_batch_name(
     labeling_batch_prefix: str,
     new_labeling_batch_frequency: BatchCreationFrequency,
 ) -> str:
     if new_labeling_batch_frequency == "never":
         return labeling_batch_prefix
+    timestamp = _generate_batch_timestamp(
+        new_labeling_batch_frequency=new_labeling_batch_frequency,
+        today=datetime.today().date(),
+    )
+    return f"{labeling_batch_prefix}_{timestamp}"
+
+
+@lru_cache(maxsize=16)
+def _generate_batch_timestamp(
+    new_labeling_batch_frequency: BatchCreationFrequency,
+    today: date,
+) -> str:
     timestamp_generator = RECREATION_INTERVAL2TIMESTAMP_GENERATOR[
         new_labeling_batch_frequency
     ]
-    timestamp = timestamp_generator()
-    return f"{labeling_batch_prefix}_{timestamp}"
+    return timestamp_generator(today)
 
 
-def generate_today_timestamp() -> str:
-    return datetime.today().strftime(TIMESTAMP_FORMAT)
+def generate_today_timestamp(today: date) -> str:
+    return today.strftime(TIMESTAMP_FORMAT)
 
 
-def generate_start_timestamp_for_this_week() -> str:
-    today = datetime.today()
+def generate_start_timestamp_for_this_week(today: date) -> str:
     return (today - timedelta(days=today.weekday())).strftime(TIMESTAMP_FORMAT)
 
 
-def generate_start_timestamp_for_this_month() -> str:
-    return datetime.today().replace(day=1).strftime(TIMESTAMP_FORMAT)
+def generate_start_timestamp_for_this_month(today: date) -> str:
+    return today.replace(day=1).strftime(TIMESTAMP_FORMAT)
 
 
 RECREATION_INTERVAL2TIMESTAMP_GENERATOR = {
@@ -569,8 +619,14 @@ def is_prediction_registration_forbidden(
 
 def encode_prediction(
     prediction: Union[sv.Detections, dict],
-) -> Tuple[str, str]:
+) -> Tuple[Union[str, bytes], str]:
     if isinstance(prediction, dict):
         return prediction["top"], "txt"
     detections_in_inference_format = serialise_sv_detections(detections=prediction)
-    return json.dumps(detections_in_inference_format), "json"
+    return _serialise_to_json(detections_in_inference_format), "json"
+
+
+def _serialise_to_json(content: dict) -> bytes:
+    if orjson is None:
+        return json.dumps(content).encode("utf-8")
+    return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
@@ -1,5 +1,4 @@
-from dataclasses import replace
-from typing import List, Literal, Optional, Type, Union
+from typing import List, Literal, Optional, Tuple, Type, Union
 from uuid import uuid4
 
 from pydantic import ConfigDict, Field, PositiveInt
@@ -98,6 +97,8 @@ class AbsoluteStaticCropBlockV1(WorkflowBlock):
         width: int,
         height: int,
     ) -> BlockResult:
+        # single random identifier is generated per batch, crops are distinguished by index
+        parent_id_prefix = f"absolute_static_crop.{uuid4()}"
         return [
             {
                 "crops": take_static_crop(
@@ -106,9 +107,10 @@ class AbsoluteStaticCropBlockV1(WorkflowBlock):
                     y_center=y_center,
                     width=width,
                     height=height,
+                    parent_id=f"{parent_id_prefix}.{idx}",
                 )
             }
-            for image in images
+            for idx, image in enumerate(images)
         ]
 
 
@@ -118,32 +120,40 @@ def take_static_crop(
     y_center: int,
     width: int,
     height: int,
+    parent_id: Optional[str] = None,
 ) -> Optional[WorkflowImageData]:
-    x_min = round(x_center - width / 2)
-    y_min = round(y_center - height / 2)
-    x_max = round(x_min + width)
-    y_max = round(y_min + height)
-    cropped_image = image.numpy_image[y_min:y_max, x_min:x_max]
+    if parent_id is None:
+        parent_id = f"absolute_static_crop.{uuid4()}"
+    numpy_image = image.numpy_image
+    x_min, y_min, x_max, y_max = calculate_crop_bounds(
+        x_center=x_center,
+        y_center=y_center,
+        width=width,
+        height=height,
+        image_height=numpy_image.shape[0],
+        image_width=numpy_image.shape[1],
+    )
+    cropped_image = numpy_image[y_min:y_max, x_min:x_max]
     if not cropped_image.size:
         return None
-    workflow_root_ancestor_coordinates = replace(
-        image.workflow_root_ancestor_metadata.origin_coordinates,
-        left_top_x=image.workflow_root_ancestor_metadata.origin_coordinates.left_top_x
-        + x_min,
-        left_top_y=image.workflow_root_ancestor_metadata.origin_coordinates.left_top_y
-        + y_min,
-    )
+    root_ancestor_metadata = image.workflow_root_ancestor_metadata
+    root_ancestor_coordinates = root_ancestor_metadata.origin_coordinates
     workflow_root_ancestor_metadata = ImageParentMetadata(
-        parent_id=image.workflow_root_ancestor_metadata.parent_id,
-        origin_coordinates=workflow_root_ancestor_coordinates,
+        parent_id=root_ancestor_metadata.parent_id,
+        origin_coordinates=OriginCoordinatesSystem(
+            left_top_x=root_ancestor_coordinates.left_top_x + x_min,
+            left_top_y=root_ancestor_coordinates.left_top_y + y_min,
+            origin_width=root_ancestor_coordinates.origin_width,
+            origin_height=root_ancestor_coordinates.origin_height,
+        ),
     )
     parent_metadata = ImageParentMetadata(
-        parent_id=f"absolute_static_crop.{uuid4()}",
+        parent_id=parent_id,
         origin_coordinates=OriginCoordinatesSystem(
             left_top_x=x_min,
             left_top_y=y_min,
-            origin_width=image.numpy_image.shape[1],
-            origin_height=image.numpy_image.shape[0],
+            origin_width=numpy_image.shape[1],
+            origin_height=numpy_image.shape[0],
         ),
     )
     return WorkflowImageData(
@@ -151,3 +161,20 @@ def take_static_crop(
         workflow_root_ancestor_metadata=workflow_root_ancestor_metadata,
         numpy_image=cropped_image,
     )
+
+
+def calculate_crop_bounds(
+    x_center: int,
+    y_center: int,
+    width: int,
+    height: int,
+    image_height: int,
+    image_width: int,
+) -> Tuple[int, int, int, int]:
+    # bounds are clipped to image - negative coordinates would otherwise be
+    # interpreted by numpy as indices counted from the end of axis
+    x_min = round(x_center - width / 2)
+    y_min = round(y_center - height / 2)
+    x_max = max(0, min(image_width, round(x_min + width)))
+    y_max = max(0, min(image_height, round(y_min + height)))
+    return max(0, x_min), max(0, y_min), x_max, y_max
@@ -184,6 +184,14 @@ class ImageParentMetadata:
 
 class WorkflowImageData:
 
+    __slots__ = (
+        "_parent_metadata",
+        "_workflow_root_ancestor_metadata",
+        "_image_reference",
+        "_base64_image",
+        "_numpy_image",
+    )
+
     def __init__(
         self,
         parent_metadata: ImageParentMetadata,
@@ -2,9 +2,12 @@ import json
 from datetime import datetime
 from functools import partial
 from typing import List, Union
+from unittest import mock
 from unittest.mock import MagicMock
 
+import cv2
 import numpy as np
+import supervision as sv
 
 from inference.core.entities.responses.inference import (
     InferenceResponseImage,
@@ -12,12 +15,16 @@ from inference.core.entities.responses.inference import (
     ObjectDetectionPrediction,
 )
 from inference.core.interfaces.camera.entities import VideoFrame
+from inference.core.interfaces.stream import sinks
 from inference.core.interfaces.stream.sinks import (
     ImageWithSourceID,
     UDPSink,
+    VideoFileSink,
+    _project_boxes_onto_letterboxed_image,
     active_learning_sink,
     multi_sink,
     render_boxes,
+    render_statistics,
 )
 
 
@@ -155,6 +162,136 @@ def test_render_boxes_completes_successfully_against_batch_input() -> None:
     ), "capture_image() should be called against resized image dictated by default parameter"
 
 
+def test_render_boxes_preserves_batch_order_when_rendering_in_parallel() -> None:
+    # given
+    video_frames = [
+        VideoFrame(
+            image=np.ones((192, 192, 3), dtype=np.uint8) * i,
+            frame_id=i,
+            frame_timestamp=datetime.now(),
+            source_id=i,
+        )
+        for i in range(6)
+    ]
+    predictions = [{"predictions": []}] * 6
+    captured_images = []
+
+    def capture_image(image: Union[ImageWithSourceID, List[ImageWithSourceID]]) -> None:
+        captured_images.extend(image)
+
+    # when
+    render_boxes(
+        video_frame=video_frames,
+        predictions=predictions,
+        display_size=None,
+        on_frame_rendered=capture_image,
+    )
+
+    # then
+    assert [i[0] for i in captured_images] == list(
+        range(6)
+    ), "Images must be assigned consecutive positions in the batch"
+    assert all(
+        (image == idx).all() for idx, image in captured_images
+    ), "Rendered images must be emitted in order of input frames"
+
+
+@mock.patch.object(sinks, "_handle_frame_rendering")
+def test_render_boxes_does_not_reuse_annotation_buffers_when_rendering_in_parallel(
+    handle_frame_rendering_mock: MagicMock,
+) -> None:
+    # given
+    handle_frame_rendering_mock.return_value = np.zeros((192, 192, 3), dtype=np.uint8)
+    video_frames = [
+        VideoFrame(
+            image=np.zeros((192, 192, 3), dtype=np.uint8),
+            frame_id=i,
+            frame_timestamp=datetime.now(),
+            source_id=i,
+        )
+        for i in range(6)
+    ]
+    predictions = [{"predictions": []}] * 6
+
+    # when
+    render_boxes(
+        video_frame=video_frames,
+        predictions=predictions,
+        on_frame_rendered=MagicMock(),
+    )
+
+    # then
+    assert handle_frame_rendering_mock.call_count == 6, "Each frame must be rendered"
+    assert all(
+        call[1]["reuse_buffer"] is False
+        for call in handle_frame_rendering_mock.call_args_list
+    ), "Pool threads must not keep per-thread copies of frames"
+
+
+@mock.patch.object(sinks, "_RENDERING_THREAD_POOL")
+def test_render_boxes_renders_sequentially_when_custom_annotator_is_provided(
+    rendering_thread_pool_mock: MagicMock,
+) -> None:
+    # given
+    video_frames = [
+        VideoFrame(
+            image=np.zeros((192, 192, 3), dtype=np.uint8),
+            frame_id=i,
+            frame_timestamp=datetime.now(),
+            source_id=i,
+        )
+        for i in range(6)
+    ]
+    predictions = [{"predictions": []}] * 6
+    captured_images = []
+
+    # when
+    render_boxes(
+        video_frame=video_frames,
+        predictions=predictions,
+        annotator=sv.BoundingBoxAnnotator(),
+        on_frame_rendered=captured_images.extend,
+    )
+
+    # then
+    rendering_thread_pool_mock.map.assert_not_called()
+    assert len(captured_images) == 6, "Each frame must be rendered"
+
+
+def test_render_boxes_registers_all_batch_frames_in_fps_monitor() -> None:
+    # given
+    video_frames = [
+        VideoFrame(
+            image=np.ones((192, 192, 3), dtype=np.uint8),
+            frame_id=1,
+            frame_timestamp=datetime.now(),
+            source_id=0,
+        ),
+        None,
+        VideoFrame(
+            image=np.ones((192, 192, 3), dtype=np.uint8),
+            frame_id=1,
+            frame_timestamp=datetime.now(),
+            source_id=2,
+        ),
+    ]
+    predictions = [{"predictions": []}, None, {"predictions": []}]
+    fps_monitor = sv.FPSMonitor()
+
+    # when
+    render_boxes(
+        video_frame=video_frames,
+        predictions=predictions,
+        fps_monitor=fps_monitor,
+        on_frame_rendered=lambda _: None,
+    )
+
+    # then
+    assert (
+        len(fps_monitor.all_timestamps) == 2
+    ), "Each non-empty frame of the batch must be registered"
+
+
 def test_render_boxes_completes_successfully_despite_malformed_predictions() -> None:
     # given
     video_frame = VideoFrame(
@@ -190,6 +327,151 @@ def test_render_boxes_completes_successfully_despite_malformed_predictions() ->
     ), "capture_image() should be called against resized image dictated by default parameter"
 
 
+def test_render_boxes_skips_annotation_when_predictions_are_empty() -> None:
+    # given
+    video_frame = VideoFrame(
+        image=np.ones((1920, 1920, 3), dtype=np.uint8) * 255,
+        frame_id=1,
+        frame_timestamp=datetime.now(),
+        source_id=37,
+    )
+    predictions = ObjectDetectionInferenceResponse(
+        predictions=[],
+        image=InferenceResponseImage(width=1920, height=1080),
+    ).model_dump(
+        by_alias=True,
+        exclude_none=True,
+    )
+    annotator = MagicMock()
+    captured_images = []
+
+    def capture_image(image: Union[ImageWithSourceID, List[ImageWithSourceID]]) -> None:
+        captured_images.append(image)
+
+    # when
+    render_boxes(
+        video_frame=video_frame,
+        predictions=predictions,
+        annotator=annotator,
+        on_frame_rendered=capture_image,
+    )
+
+    # then
+    annotator.annotate.assert_not_called()
+    assert (
+        len(captured_images) == 1
+    ), "One capture_image() side effect expected after rendering"
+    assert captured_images[0][1].shape == (
+        720,
+        1280,
+        3,
+    ), "capture_image() should be called against resized image dictated by default parameter"
+
+
+def test_project_boxes_onto_letterboxed_image_when_padding_is_horizontal() -> None:
+    # given
+    xyxy = np.array([[0, 0, 1920, 1920], [960, 480, 1440, 960]], dtype=np.float64)
+
+    # when
+    result = _project_boxes_onto_letterboxed_image(
+        xyxy=xyxy,
+        image_size=(1920, 1920),
+        desired_size=(1280, 720),
+    )
+
+    # then
+    assert np.allclose(
+        result, np.array([[280, 0, 1000, 720], [640, 180, 820, 360]])
+    ), "Boxes must be scaled by 0.375 and shifted by left padding of 280px"
+
+
+def test_project_boxes_onto_letterboxed_image_when_padding_is_vertical() -> None:
+    # given
+    xyxy = np.array([[0, 0, 200, 100]], dtype=np.float64)
+
+    # when
+    result = _project_boxes_onto_letterboxed_image(
+        xyxy=xyxy,
+        image_size=(200, 100),
+        desired_size=(100, 100),
+    )
+
+    # then
+    assert np.allclose(
+        result, np.array([[0, 25, 100, 75]])
+    ), "Boxes must be scaled by 0.5 and shifted by top padding of 25px"
+
+
+def test_render_statistics_draws_overlay_in_bottom_left_corner() -> None:
+    # given
+    image = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    # when
+    result = render_statistics(image=image, frame_timestamp=datetime.now(), fps=30.0)
+
+    # then
+    statistics_region = result[640:, :400]
+    assert result.shape == (720, 1280, 3), "Image size must not be changed"
+    assert (
+        statistics_region.any()
+    ), "Statistics are expected to be drawn in the bottom-left corner"
+    assert not result[:640].any(), "Top part of the image must not be touched"
+    assert not result[:, 400:].any(), "Right part of the image must not be touched"
+
+
+def test_render_statistics_keeps_image_content_around_text() -> None:
+    # given
+    image = np.ones((720, 1280, 3), dtype=np.uint8) * 255
+
+    # when
+    result = render_statistics(image=image, frame_timestamp=datetime.now(), fps=30.0)
+
+    # then
+    statistics_region = result[640:, :400]
+    background_pixels = (statistics_region == 255).all(axis=2)
+    assert (
+        statistics_region != 255
+    ).any(), "Statistics are expected to be drawn in the bottom-left corner"
+    assert background_pixels.any(), "Pixels around text must keep original content"
+
+
+def test_render_statistics_when_image_is_grayscale() -> None:
+    # given
+    image = np.ones((720, 1280), dtype=np.uint8) * 255
+
+    # when
+    result = render_statistics(image=image, frame_timestamp=datetime.now(), fps=30.0)
+
+    # then
+    assert result.shape == (720, 1280), "Image size must not be changed"
+    assert (
+        result[640:, :400] != 255
+    ).any(), "Statistics are expected to be drawn in the bottom-left corner"
+    assert (result[:640] == 255).all(), "Top part of the image must not be touched"
+
+
+def test_render_statistics_when_image_is_smaller_than_text() -> None:
+    # given
+    image = np.zeros((50, 100, 3), dtype=np.uint8)
+
+    # when
+    result = render_statistics(image=image, frame_timestamp=None, fps=30.0)
+
+    # then
+    assert result.shape == (50, 100, 3), "Image size must not be changed"
+
+
+def test_render_statistics_when_no_statistics_provided() -> None:
+    # given
+    image = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    # when
+    result = render_statistics(image=image, frame_timestamp=None, fps=None)
+
+    # then
+    assert not result.any(), "Image must not be changed"
+
+
 def test_udp_sends_data_through_socket() -> None:
     # given
     socket = MagicMock()
@@ -228,6 +510,47 @@ def test_udp_sends_data_through_socket() -> None:
     assert "emission_time" in decoded_message["inference_metadata"]
 
 
+def test_udp_sends_data_through_socket_when_batch_input_is_provided() -> None:
+    # given
+    socket = MagicMock()
+    video_frames = [
+        VideoFrame(
+            image=np.ones((128, 128, 3), dtype=np.uint8) * 255,
+            frame_id=1,
+            frame_timestamp=datetime.now(),
+            source_id=0,
+        ),
+        None,
+        VideoFrame(
+            image=np.ones((128, 128, 3), dtype=np.uint8) * 255,
+            frame_id=2,
+            frame_timestamp=datetime.now(),
+            source_id=2,
+        ),
+    ]
+    predictions = [{"some": "prediction"}, None, {"other": "prediction"}]
+    udp_sink = UDPSink(
+        ip_address="127.0.0.1",
+        port=9090,
+        udp_socket=socket,
+    )
+
+    # when
+    udp_sink.send_predictions(video_frame=video_frames, predictions=predictions)
+
+    # then
+    assert socket.sendto.call_count == 2, "Empty batch elements must be skipped"
+    first_message = json.loads(socket.sendto.call_args_list[0][0][0])
+    second_message = json.loads(socket.sendto.call_args_list[1][0][0])
+    assert first_message["some"] == "prediction"
+    assert first_message["inference_metadata"]["source_id"] == 0
+    assert second_message["other"] == "prediction"
+    assert second_message["inference_metadata"]["source_id"] == 2
+    assert all(
+        call[0][1] == ("127.0.0.1", 9090) for call in socket.sendto.call_args_list
+    ), "Data must be sent to 127.0.0.1:9090"
+
+
 def test_multi_sink_when_error_occurs() -> None:
     # given
     video_frame = VideoFrame(
@@ -394,3 +717,69 @@ def test_active_learning_sink_with_batch_input() -> None:
         prediction_type="object-detection",
         disable_preproc_auto_orient=False,
     )
+
+
+def test_active_learning_sink_with_batch_input_keeps_frames_aligned_with_predictions() -> (
+    None
+):
+    # given
+    active_learning_middleware = MagicMock()
+    sink = partial(
+        active_learning_sink,
+        active_learning_middleware=active_learning_middleware,
+        model_type="object-detection",
+    )
+    video_frames = [
+        VideoFrame(
+            image=np.ones((128, 128, 3), dtype=np.uint8) * 255,
+            frame_id=1,
+            frame_timestamp=datetime.now(),
+        ),
+        None,
+        VideoFrame(
+            image=np.ones((128, 128, 3), dtype=np.uint8) * 128,
+            frame_id=3,
+            frame_timestamp=datetime.now(),
+        ),
+    ]
+    predictions = [None, None, {"other": "prediction"}]
+
+    # when
+    sink(predictions, video_frames)
+
+    # then
+    active_learning_middleware.register_batch.assert_called_once_with(
+        inference_inputs=[video_frames[2].image],
+        predictions=[predictions[2]],
+        prediction_type="object-detection",
+        disable_preproc_auto_orient=False,
+    )
+
+
+def test_video_file_sink_saves_all_frames_before_release(tmp_path) -> None:
+    # given
+    video_file_name = str(tmp_path / "output.avi")
+    video_sink = VideoFileSink.init(
+        video_file_name=video_file_name,
+        display_size=(320, 240),
+        quiet=True,
+        video_frame_size=(320, 240),
+    )
+    video_frame = VideoFrame(
+        image=np.ones((480, 640, 3), dtype=np.uint8) * 255,
+        frame_id=1,
+        frame_timestamp=datetime.now(),
+    )
+
+    # when
+    for _ in range(5):
+        video_sink.on_prediction({"predictions": []}, video_frame)
+    video_sink.release()
+
+    # then
+    video = cv2.VideoCapture(video_file_name)
+    frames_count = 0
+    while video.read()[0]:
+        frames_count += 1
+    video.release()
+    assert frames_count == 5, "All frames must be written when sink is released"
@@ -10,7 +10,10 @@ from inference.core.utils.preprocess import (
     ContrastAdjustmentType,
     apply_contrast_adjustment,
     contrast_adjustments_should_be_applied,
+    downscale_image_keeping_aspect_ratio,
+    get_size_keeping_aspect_ratio,
     grayscale_conversion_should_be_applied,
+    letterbox_image,
     prepare,
     static_crop_should_be_applied,
     take_static_crop,
@@ -296,3 +299,68 @@ def test_prepare_when_misconfiguration_error_is_encountered(
             image=np.zeros((128, 128, 3), dtype=np.uint8),
             preproc={"static-crop": {"enabled": True}},
         )
+
+
+def test_letterbox_image_when_padding_is_required() -> None:
+    # given
+    image = np.ones((100, 200, 3), dtype=np.uint8) * 255
+
+    # when
+    result = letterbox_image(image=image, desired_size=(100, 100))
+
+    # then
+    assert result.shape == (100, 100, 3), "Image must be resized to desired size"
+    assert (result[25:75] == 255).all(), "Resized image must be placed in the center"
+    assert (result[:25] == 0).all() and (
+        result[75:] == 0
+    ).all(), "Image must be padded with black stripes"
+
+
+def test_letterbox_image_when_aspect_ratio_matches() -> None:
+    # given
+    image = np.ones((100, 200, 3), dtype=np.uint8) * 255
+
+    # when
+    result = letterbox_image(image=image, desired_size=(100, 50))
+
+    # then
+    assert result.shape == (50, 100, 3), "Image must be resized to desired size"
+    assert (result == 255).all(), "No padding expected"
+    assert result is not image, "New array must be returned"
+
+
+def test_get_size_keeping_aspect_ratio() -> None:
+    # when
+    result = get_size_keeping_aspect_ratio(
+        image_size=(1920, 1080), desired_size=(1280, 1280)
+    )
+
+    # then
+    assert result == (1280, 720)
+
+
+def test_downscale_image_keeping_aspect_ratio_when_image_is_larger() -> None:
+    # given
+    image = np.ones((1000, 2000, 3), dtype=np.uint8) * 255
+
+    # when
+    result = downscale_image_keeping_aspect_ratio(
+        image=image, desired_size=(1024, 1024)
+    )
+
+    # then
+    assert result.shape == (512, 1024, 3), "Longer side must be fit into desired size"
+    assert (result == 255).all(), "Pixel values must be preserved"
+
+
+def test_downscale_image_keeping_aspect_ratio_when_image_is_smaller() -> None:
+    # given
+    image = np.ones((100, 200, 3), dtype=np.uint8)
+
+    # when
+    result = downscale_image_keeping_aspect_ratio(
+        image=image, desired_size=(1024, 1024)
+    )
+
+    # then
+    assert result is image, "Image smaller than desired size must not be touched"
@@ -14,7 +14,7 @@ def roboflow_api_key() -> str:
     return os.environ["ROBOFLOW_API_KEY"]
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def model_manager() -> ModelManager:
     model_registry = RoboflowModelRegistry(ROBOFLOW_MODEL_TYPES)
     model_manager = ModelManager(model_registry=model_registry)
@@ -1,10 +1,15 @@
 """
 This test module requires Anthropic AI API key passed via env variable WORKFLOWS_TEST_ANTHROPIC_API_KEY.
-This is supposed to be used only locally, as that would be too much of a cost in CI
+This is supposed to be used only locally, as that would be too much of a cost in CI.
+
+Tests are independent and bound by Anthropic API latency, so it is advised to run them concurrently:
+pytest -n 8 tests/workflows/integration_tests/execution/test_workflow_with_claude_models.py
 """
 
 import os
+from typing import Callable, Dict
 
+import cv2
 import numpy as np
 import pytest
 
@@ -17,6 +22,53 @@ from tests.workflows.integration_tests.execution.workflows_gallery_collector.dec
 )
 
 ANTHROPIC_API_KEY = os.getenv("WORKFLOWS_TEST_ANTHROPIC_API_KEY")
+ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "assets"))
+
+
+@pytest.fixture(scope="module")
+def dogs_image() -> np.ndarray:
+    return cv2.imread(os.path.join(ASSETS_DIR, "dogs.jpg"))
+
+
+@pytest.fixture(scope="module")
+def license_plate_image() -> np.ndarray:
+    return cv2.imread(os.path.join(ASSETS_DIR, "license_plate.jpg"))
+
+
+@pytest.fixture(scope="module")
+def get_claude_execution_engine(
+    model_manager: ModelManager,
+) -> Callable[[str], ExecutionEngine]:
+    workflow_init_parameters = {
+        "workflows_core.model_manager": model_manager,
+        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
+    }
+    workflows = {
+        "UNCONSTRAINED_WORKFLOW": UNCONSTRAINED_WORKFLOW,
+        "OCR_WORKFLOW": OCR_WORKFLOW,
+        "VQA_WORKFLOW": VQA_WORKFLOW,
+        "CAPTION_WORKFLOW": CAPTION_WORKFLOW,
+        "CLASSIFICATION_WORKFLOW": CLASSIFICATION_WORKFLOW,
+        "MULTI_LABEL_CLASSIFICATION_WORKFLOW": MULTI_LABEL_CLASSIFICATION_WORKFLOW,
+        "STRUCTURED_PROMPTING_WORKFLOW": STRUCTURED_PROMPTING_WORKFLOW,
+        "OBJECT_DETECTION_WORKFLOW": OBJECT_DETECTION_WORKFLOW,
+        "VLM_AS_SECONDARY_CLASSIFIER_WORKFLOW": VLM_AS_SECONDARY_CLASSIFIER_WORKFLOW,
+    }
+    execution_engines: Dict[str, ExecutionEngine] = {}
+
+    def get_execution_engine(workflow_name: str) -> ExecutionEngine:
+        # workflows are compiled on first use, so only the ones needed by selected
+        # tests get compiled - and each of them at most once per module
+        if workflow_name not in execution_engines:
+            execution_engines[workflow_name] = ExecutionEngine.init(
+                workflow_definition=workflows[workflow_name],
+                init_parameters=workflow_init_parameters,
+                max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
+            )
+        return execution_engines[workflow_name]
+
+    return get_execution_engine
+
 
 UNCONSTRAINED_WORKFLOW = {
     "version": "1.0",
@@ -44,50 +96,6 @@ UNCONSTRAINED_WORKFLOW = {
 }
 
 
-@add_to_workflows_gallery(
-    category="Workflows with Visual Language Models",
-    use_case_title="Prompting Anthropic Claude with arbitrary prompt",
-    use_case_description="""
-In this example, Anthropic Claude model is prompted with arbitrary text from user 
-    """,
-    workflow_definition=UNCONSTRAINED_WORKFLOW,
-    workflow_name_in_app="claude-arbitrary-prompt",
-)
-@pytest.mark.skipif(
-    condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
-)
-def test_workflow_with_unconstrained_prompt(
-    model_manager: ModelManager,
-    dogs_image: np.ndarray,
-) -> None:
-    # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=UNCONSTRAINED_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
-
-    # when
-    result = execution_engine.run(
-        runtime_parameters={
-            "image": [dogs_image],
-            "api_key": ANTHROPIC_API_KEY,
-            "prompt": "What is the topic of the image?",
-        }
-    )
-
-    # then
-    assert len(result) == 1, "Single image given, expected single output"
-    assert set(result[0].keys()) == {"result"}, "Expected all outputs to be delivered"
-    assert (
-        isinstance(result[0]["result"], str) and len(result[0]["result"]) > 0
-    ), "Expected non-empty string generated"
-
-
 OCR_WORKFLOW = {
     "version": "1.0",
     "inputs": [
@@ -113,50 +121,6 @@ OCR_WORKFLOW = {
 }
 
 
-@add_to_workflows_gallery(
-    category="Workflows with Visual Language Models",
-    use_case_title="Using Anthropic Claude as OCR model",
-    use_case_description="""
-In this example, Anthropic Claude model is used as OCR system. User just points task type and do not need to provide
-any prompt.
-    """,
-    workflow_definition=OCR_WORKFLOW,
-    workflow_name_in_app="claude-ocr",
-)
-@pytest.mark.skipif(
-    condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
-)
-def test_workflow_with_ocr_prompt(
-    model_manager: ModelManager,
-    license_plate_image: np.ndarray,
-) -> None:
-    # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=OCR_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
-
-    # when
-    result = execution_engine.run(
-        runtime_parameters={
-            "image": [license_plate_image],
-            "api_key": ANTHROPIC_API_KEY,
-        }
-    )
-
-    # then
-    assert len(result) == 1, "Single image given, expected single output"
-    assert set(result[0].keys()) == {"result"}, "Expected all outputs to be delivered"
-    assert (
-        isinstance(result[0]["result"], str) and len(result[0]["result"]) > 0
-    ), "Expected non-empty string generated"
-
-
 VQA_WORKFLOW = {
     "version": "1.0",
     "inputs": [
@@ -184,50 +148,6 @@ VQA_WORKFLOW = {
 }
 
 
-@add_to_workflows_gallery(
-    category="Workflows with Visual Language Models",
-    use_case_title="Using Anthropic Claude as Visual Question Answering system",
-    use_case_description="""
-In this example, Anthropic Claude model is used as VQA system. User provides question via prompt.
-    """,
-    workflow_definition=VQA_WORKFLOW,
-    workflow_name_in_app="claude-vqa",
-)
-@pytest.mark.skipif(
-    condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
-)
-def test_workflow_with_vqa_prompt(
-    model_manager: ModelManager,
-    license_plate_image: np.ndarray,
-) -> None:
-    # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=VQA_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
-
-    # when
-    result = execution_engine.run(
-        runtime_parameters={
-            "image": [license_plate_image],
-            "api_key": ANTHROPIC_API_KEY,
-            "prompt": "What are the brands of the cars?",
-        }
-    )
-
-    # then
-    assert len(result) == 1, "Single image given, expected single output"
-    assert set(result[0].keys()) == {"result"}, "Expected all outputs to be delivered"
-    assert (
-        isinstance(result[0]["result"], str) and len(result[0]["result"]) > 0
-    ), "Expected non-empty string generated"
-
-
 CAPTION_WORKFLOW = {
     "version": "1.0",
     "inputs": [
@@ -254,6 +174,34 @@ CAPTION_WORKFLOW = {
 }
 
 
+@add_to_workflows_gallery(
+    category="Workflows with Visual Language Models",
+    use_case_title="Prompting Anthropic Claude with arbitrary prompt",
+    use_case_description="""
+In this example, Anthropic Claude model is prompted with arbitrary text from user 
+    """,
+    workflow_definition=UNCONSTRAINED_WORKFLOW,
+    workflow_name_in_app="claude-arbitrary-prompt",
+)
+@add_to_workflows_gallery(
+    category="Workflows with Visual Language Models",
+    use_case_title="Using Anthropic Claude as OCR model",
+    use_case_description="""
+In this example, Anthropic Claude model is used as OCR system. User just points task type and do not need to provide
+any prompt.
+    """,
+    workflow_definition=OCR_WORKFLOW,
+    workflow_name_in_app="claude-ocr",
+)
+@add_to_workflows_gallery(
+    category="Workflows with Visual Language Models",
+    use_case_title="Using Anthropic Claude as Visual Question Answering system",
+    use_case_description="""
+In this example, Anthropic Claude model is used as VQA system. User provides question via prompt.
+    """,
+    workflow_definition=VQA_WORKFLOW,
+    workflow_name_in_app="claude-vqa",
+)
 @add_to_workflows_gallery(
     category="Workflows with Visual Language Models",
     use_case_title="Using Anthropic Claude as Image Captioning system",
@@ -266,26 +214,41 @@ In this example, Anthropic Claude model is used as Image Captioning system.
 @pytest.mark.skipif(
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
-def test_workflow_with_captioning_prompt(
-    model_manager: ModelManager,
-    license_plate_image: np.ndarray,
+@pytest.mark.parametrize(
+    "workflow_name, image_fixture_name, runtime_parameters",
+    [
+        (
+            "UNCONSTRAINED_WORKFLOW",
+            "dogs_image",
+            {"prompt": "What is the topic of the image?"},
+        ),
+        ("OCR_WORKFLOW", "license_plate_image", {}),
+        (
+            "VQA_WORKFLOW",
+            "license_plate_image",
+            {"prompt": "What are the brands of the cars?"},
+        ),
+        ("CAPTION_WORKFLOW", "license_plate_image", {}),
+    ],
+    ids=["unconstrained", "ocr", "vqa", "captioning"],
+)
+def test_workflow_with_free_text_output(
+    request: pytest.FixtureRequest,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
+    workflow_name: str,
+    image_fixture_name: str,
+    runtime_parameters: dict,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=CAPTION_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
+    execution_engine = get_claude_execution_engine(workflow_name)
+    image = request.getfixturevalue(image_fixture_name)
 
     # when
     result = execution_engine.run(
         runtime_parameters={
-            "image": [license_plate_image],
+            "image": [image],
             "api_key": ANTHROPIC_API_KEY,
+            **runtime_parameters,
         }
     )
 
@@ -365,19 +328,11 @@ classification predictions - in this case we extract top-class property.
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
 def test_workflow_with_multi_class_classifier_prompt(
-    model_manager: ModelManager,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
     dogs_image: np.ndarray,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=CLASSIFICATION_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
+    execution_engine = get_claude_execution_engine("CLASSIFICATION_WORKFLOW")
 
     # when
     result = execution_engine.run(
@@ -466,18 +421,12 @@ classification predictions - in this case we extract top-class property.
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
 def test_workflow_with_multi_label_classifier_prompt(
-    model_manager: ModelManager,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
     dogs_image: np.ndarray,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=MULTI_LABEL_CLASSIFICATION_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
+    execution_engine = get_claude_execution_engine(
+        "MULTI_LABEL_CLASSIFICATION_WORKFLOW"
     )
 
     # when
@@ -556,19 +505,11 @@ transformed using `roboflow_core/property_definition@v1` block.
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
 def test_workflow_with_structured_prompt(
-    model_manager: ModelManager,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
     dogs_image: np.ndarray,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=STRUCTURED_PROMPTING_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
+    execution_engine = get_claude_execution_engine("STRUCTURED_PROMPTING_WORKFLOW")
 
     # when
     result = execution_engine.run(
@@ -640,19 +581,11 @@ which can later be used by other blocks processing object-detection predictions.
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
 def test_workflow_with_object_detection_prompt(
-    model_manager: ModelManager,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
     dogs_image: np.ndarray,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=OBJECT_DETECTION_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
-    )
+    execution_engine = get_claude_execution_engine("OBJECT_DETECTION_WORKFLOW")
 
     # when
     result = execution_engine.run(
@@ -753,18 +686,12 @@ Breeds that we classify: `russell-terrier`, `wirehaired-pointing-griffon`, `beag
     condition=ANTHROPIC_API_KEY is None, reason="Anthropic API key not provided"
 )
 def test_workflow_with_secondary_classifier(
-    model_manager: ModelManager,
+    get_claude_execution_engine: Callable[[str], ExecutionEngine],
     dogs_image: np.ndarray,
 ) -> None:
     # given
-    workflow_init_parameters = {
-        "workflows_core.model_manager": model_manager,
-        "workflows_core.step_execution_mode": StepExecutionMode.LOCAL,
-    }
-    execution_engine = ExecutionEngine.init(
-        workflow_definition=VLM_AS_SECONDARY_CLASSIFIER_WORKFLOW,
-        init_parameters=workflow_init_parameters,
-        max_concurrent_steps=WORKFLOWS_MAX_CONCURRENT_STEPS,
+    execution_engine = get_claude_execution_engine(
+        "VLM_AS_SECONDARY_CLASSIFIER_WORKFLOW"
     )
 
     # when
@@ -189,6 +189,20 @@ def test_serialise_sv_detections() -> None:
     }
 
 
+def test_serialise_sv_detections_when_no_detections_provided() -> None:
+    # given
+    detections = sv.Detections.empty()
+
+    # when
+    result = serialise_sv_detections(detections=detections)
+
+    # then
+    assert result == {
+        "image": {"width": None, "height": None},
+        "predictions": [],
+    }
+
+
 def test_serialise_image() -> None:
     # given
     np_image = np.zeros((192, 168, 3), dtype=np.uint8)
@@ -0,0 +1,50 @@
+from typing import Generator
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+
+from inference.core.workflows.core_steps.models.foundation.anthropic_claude import v1
+from inference.core.workflows.core_steps.models.foundation.anthropic_claude.v1 import (
+    execute_claude_request,
+)
+
+
+@pytest.fixture(scope="function")
+def empty_anthropic_clients_cache() -> Generator[None, None, None]:
+    # clients are cached at module level - the ones created with mocks must not
+    # leak into other tests
+    v1._get_anthropic_client.cache_clear()
+    yield
+    v1._get_anthropic_client.cache_clear()
+
+
+@mock.patch.object(v1.anthropic, "Anthropic")
+def test_execute_claude_request_reuses_client_for_the_same_api_key(
+    anthropic_client_class_mock: MagicMock,
+    empty_anthropic_clients_cache: None,
+) -> None:
+    # given
+    client = anthropic_client_class_mock.return_value
+    client.messages.create.return_value.content = [MagicMock(text="response")]
+
+    # when
+    results = [
+        execute_claude_request(
+            system_prompt=None,
+            messages=[],
+            model_version="claude-3-haiku",
+            max_tokens=128,
+            temperature=None,
+            api_key=api_key,
+        )
+        for api_key in ["my-key", "my-key", "other-key"]
+    ]
+
+    # then
+    assert results == ["response"] * 3
+    assert anthropic_client_class_mock.call_args_list == [
+        mock.call(api_key="my-key"),
+        mock.call(api_key="other-key"),
+    ], "Expected client to be created once per API key"
+    assert client.messages.create.call_count == 3
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import supervision as sv
+
+from inference.core.workflows.execution_engine.entities.base import (
+    ImageParentMetadata,
+    WorkflowImageData,
+)
+
+
+@pytest.fixture(scope="module")
+def image() -> WorkflowImageData:
+    return WorkflowImageData(
+        parent_metadata=ImageParentMetadata(parent_id="parent"),
+        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
+    )
+
+
+@pytest.fixture(scope="function")
+def prediction() -> dict:
+    return {
+        "top": "car",
+        "predictions": [
+            {"class": "car", "confidence": 0.7},
+            {"class": "truck", "confidence": 0.3},
+        ],
+    }
+
+
+@pytest.fixture(scope="function")
+def detections() -> sv.Detections:
+    return sv.Detections(
+        xyxy=np.array([[1, 1, 2, 2], [3, 3, 4, 4]], dtype=np.float64),
+        class_id=np.array([1, 2]),
+        confidence=np.array([0.1, 0.9], dtype=np.float64),
+        data={
+            "class_name": np.array(["cat", "dog"]),
+            "detection_id": np.array(["first", "second"]),
+            "parent_id": np.array(["image", "image"]),
+            "parent_dimensions": np.array(
+                [
+                    [192, 168],
+                    [192, 168],
+                ]
+            ),
+            "image_dimensions": np.array(
+                [
+                    [192, 168],
+                    [192, 168],
+                ]
+            ),
+        },
+    )
@@ -3,7 +3,7 @@ import json
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest import mock
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock
 
 import numpy as np
 import pytest
@@ -29,6 +29,43 @@ from inference.core.workflows.execution_engine.entities.base import (
 )
 
 
+def _get_workspace_name_cache_key(api_key: str) -> str:
+    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
+    return f"workflows:api_key_to_workspace:{api_key_hash}"
+
+
+EXPECTED_SERIALISED_DETECTIONS = {
+    "image": {
+        "width": 168,
+        "height": 192,
+    },
+    "predictions": [
+        {
+            "width": 1.0,
+            "height": 1.0,
+            "x": 1.5,
+            "y": 1.5,
+            "confidence": 0.1,
+            "class_id": 1,
+            "class": "cat",
+            "detection_id": "first",
+            "parent_id": "image",
+        },
+        {
+            "width": 1.0,
+            "height": 1.0,
+            "x": 3.5,
+            "y": 3.5,
+            "confidence": 0.9,
+            "class_id": 2,
+            "class": "dog",
+            "detection_id": "second",
+            "parent_id": "image",
+        },
+    ],
+}
+
+
 def test_encode_prediction_when_classification_prediction_provided() -> None:
     # given
     prediction = {
@@ -46,66 +83,17 @@ def test_encode_prediction_when_classification_prediction_provided() -> None:
     assert result == ("car", "txt"), "Expected top class with txt format returned"
 
 
-def test_encode_prediction_when_sv_detections_provided() -> None:
-    # given
-    detections = sv.Detections(
-        xyxy=np.array([[1, 1, 2, 2], [3, 3, 4, 4]], dtype=np.float64),
-        class_id=np.array([1, 2]),
-        confidence=np.array([0.1, 0.9], dtype=np.float64),
-        data={
-            "class_name": np.array(["cat", "dog"]),
-            "detection_id": np.array(["first", "second"]),
-            "parent_id": np.array(["image", "image"]),
-            "parent_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-            "image_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-        },
-    )
-
+def test_encode_prediction_when_sv_detections_provided(
+    detections: sv.Detections,
+) -> None:
     # when
     result = encode_prediction(prediction=detections)
 
     # then
     assert result[1] == "json", "Expected JSON format of encoding"
-    assert json.loads(result[0]) == {
-        "image": {
-            "width": 168,
-            "height": 192,
-        },
-        "predictions": [
-            {
-                "width": 1.0,
-                "height": 1.0,
-                "x": 1.5,
-                "y": 1.5,
-                "confidence": 0.1,
-                "class_id": 1,
-                "class": "cat",
-                "detection_id": "first",
-                "parent_id": "image",
-            },
-            {
-                "width": 1.0,
-                "height": 1.0,
-                "x": 3.5,
-                "y": 3.5,
-                "confidence": 0.9,
-                "class_id": 2,
-                "class": "dog",
-                "detection_id": "second",
-                "parent_id": "image",
-            },
-        ],
-    }, "Expected prediction to be serialised properly"
+    assert (
+        json.loads(result[0]) == EXPECTED_SERIALISED_DETECTIONS
+    ), "Expected prediction to be serialised properly"
 
 
 def test_is_prediction_registration_forbidden_when_prediction_is_empty() -> None:
@@ -270,64 +258,11 @@ def test_register_datapoint_when_prediction_registration_should_be_forbidden(
 def test_register_datapoint_when_prediction_registration_should_be_successful(
     register_image_at_roboflow_mock: MagicMock,
     annotate_image_at_roboflow_mock: MagicMock,
+    detections: sv.Detections,
 ) -> None:
     # given
     register_image_at_roboflow_mock.return_value = {"id": "backend_id"}
-    detections = sv.Detections(
-        xyxy=np.array([[1, 1, 2, 2], [3, 3, 4, 4]], dtype=np.float64),
-        class_id=np.array([1, 2]),
-        confidence=np.array([0.1, 0.9], dtype=np.float64),
-        data={
-            "class_name": np.array(["cat", "dog"]),
-            "detection_id": np.array(["first", "second"]),
-            "parent_id": np.array(["image", "image"]),
-            "parent_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-            "image_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-            "inference_id": np.array(["a", "a"]),
-        },
-    )
-    expected_registered_prediction = json.dumps(
-        {
-            "image": {
-                "width": 168,
-                "height": 192,
-            },
-            "predictions": [
-                {
-                    "width": 1.0,
-                    "height": 1.0,
-                    "x": 1.5,
-                    "y": 1.5,
-                    "confidence": 0.1,
-                    "class_id": 1,
-                    "class": "cat",
-                    "detection_id": "first",
-                    "parent_id": "image",
-                },
-                {
-                    "width": 1.0,
-                    "height": 1.0,
-                    "x": 3.5,
-                    "y": 3.5,
-                    "confidence": 0.9,
-                    "class_id": 2,
-                    "class": "dog",
-                    "detection_id": "second",
-                    "parent_id": "image",
-                },
-            ],
-        }
-    )
+    detections.data["inference_id"] = np.array(["a", "a"])
 
     # when
     result = register_datapoint(
@@ -353,10 +288,14 @@ def test_register_datapoint_when_prediction_registration_should_be_successful(
         dataset_id="my_project",
         local_image_id="local_id",
         roboflow_image_id="backend_id",
-        annotation_content=expected_registered_prediction,
+        annotation_content=mock.ANY,
         annotation_file_type="json",
         is_prediction=True,
     )
+    assert (
+        json.loads(annotate_image_at_roboflow_mock.call_args[1]["annotation_content"])
+        == EXPECTED_SERIALISED_DETECTIONS
+    ), "Expected prediction to be serialised properly"
 
 
 @mock.patch.object(v1, "annotate_image_at_roboflow")
@@ -364,63 +303,10 @@ def test_register_datapoint_when_prediction_registration_should_be_successful(
 def test_register_datapoint_when_prediction_registration_should_be_successful_but_without_inference_id(
     register_image_at_roboflow_mock: MagicMock,
     annotate_image_at_roboflow_mock: MagicMock,
+    detections: sv.Detections,
 ) -> None:
     # given
     register_image_at_roboflow_mock.return_value = {"id": "backend_id"}
-    detections = sv.Detections(
-        xyxy=np.array([[1, 1, 2, 2], [3, 3, 4, 4]], dtype=np.float64),
-        class_id=np.array([1, 2]),
-        confidence=np.array([0.1, 0.9], dtype=np.float64),
-        data={
-            "class_name": np.array(["cat", "dog"]),
-            "detection_id": np.array(["first", "second"]),
-            "parent_id": np.array(["image", "image"]),
-            "parent_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-            "image_dimensions": np.array(
-                [
-                    [192, 168],
-                    [192, 168],
-                ]
-            ),
-        },
-    )
-    expected_registered_prediction = json.dumps(
-        {
-            "image": {
-                "width": 168,
-                "height": 192,
-            },
-            "predictions": [
-                {
-                    "width": 1.0,
-                    "height": 1.0,
-                    "x": 1.5,
-                    "y": 1.5,
-                    "confidence": 0.1,
-                    "class_id": 1,
-                    "class": "cat",
-                    "detection_id": "first",
-                    "parent_id": "image",
-                },
-                {
-                    "width": 1.0,
-                    "height": 1.0,
-                    "x": 3.5,
-                    "y": 3.5,
-                    "confidence": 0.9,
-                    "class_id": 2,
-                    "class": "dog",
-                    "detection_id": "second",
-                    "parent_id": "image",
-                },
-            ],
-        }
-    )
 
     # when
     result = register_datapoint(
@@ -446,10 +332,14 @@ def test_register_datapoint_when_prediction_registration_should_be_successful_bu
         dataset_id="my_project",
         local_image_id="local_id",
         roboflow_image_id="backend_id",
-        annotation_content=expected_registered_prediction,
+        annotation_content=mock.ANY,
         annotation_file_type="json",
         is_prediction=True,
     )
+    assert (
+        json.loads(annotate_image_at_roboflow_mock.call_args[1]["annotation_content"])
+        == EXPECTED_SERIALISED_DETECTIONS
+    ), "Expected prediction to be serialised properly"
 
 
 @mock.patch.object(v1, "register_image_at_roboflow")
@@ -613,8 +503,7 @@ def test_generate_batch_name(
 def test_get_workspace_name_when_cache_contains_workspace_name() -> None:
     # given
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache = MemoryCache()
     cache.set(key=expected_cache_key, value="my_workspace")
 
@@ -634,8 +523,7 @@ def test_get_workspace_name_when_cache_does_not_contain_workspace_name(
     # given
     api_key = "my_api_key"
     cache = MemoryCache()
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     get_roboflow_workspace_mock.return_value = "workspace_from_api"
 
     # when
@@ -653,25 +541,15 @@ def test_get_workspace_name_when_cache_does_not_contain_workspace_name(
 @mock.patch.object(v1, "use_credit_of_matching_strategy")
 def test_execute_registration_when_quota_limit_exceeded(
     use_credit_of_matching_strategy_mock: MagicMock,
+    image: WorkflowImageData,
+    prediction: dict,
 ) -> None:
     # given
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache = MemoryCache()
     cache.set(key=expected_cache_key, value="my_workspace")
     use_credit_of_matching_strategy_mock.return_value = None
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
-    prediction = {
-        "top": "car",
-        "predictions": [
-            {"class": "car", "confidence": 0.7},
-            {"class": "truck", "confidence": 0.3},
-        ],
-    }
 
     # when
     result = execute_registration(
@@ -706,25 +584,15 @@ def test_execute_registration_when_error_in_registration_happened(
     use_credit_of_matching_strategy_mock: MagicMock,
     register_datapoint_mock: MagicMock,
     return_strategy_credit_mock: MagicMock,
+    image: WorkflowImageData,
+    prediction: dict,
 ) -> None:
     # given
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache = MemoryCache()
     cache.set(key=expected_cache_key, value="my_workspace")
     use_credit_of_matching_strategy_mock.return_value = "my_strategy"
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
-    prediction = {
-        "top": "car",
-        "predictions": [
-            {"class": "car", "confidence": 0.7},
-            {"class": "truck", "confidence": 0.3},
-        ],
-    }
     register_datapoint_mock.side_effect = Exception()
 
     # when
@@ -766,8 +634,7 @@ def test_execute_registration_when_registration_should_be_successful(
 ) -> None:
     # given
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache = MemoryCache()
     cache.set(key=expected_cache_key, value="my_workspace")
     use_credit_of_matching_strategy_mock.return_value = "my_strategy"
@@ -858,7 +725,10 @@ def test_run_sink_when_api_key_is_not_specified() -> None:
         )
 
 
-def test_run_sink_when_sink_is_disabled_by_configuration() -> None:
+def test_run_sink_when_sink_is_disabled_by_configuration(
+    image: WorkflowImageData,
+    prediction: dict,
+) -> None:
     # given
     data_collector_block = RoboflowDatasetUploadBlockV1(
         cache=MemoryCache(),
@@ -866,17 +736,6 @@ def test_run_sink_when_sink_is_disabled_by_configuration() -> None:
         background_tasks=None,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
-    prediction = {
-        "top": "car",
-        "predictions": [
-            {"class": "car", "confidence": 0.7},
-            {"class": "truck", "confidence": 0.3},
-        ],
-    }
     indices = [(0,), (1,), (2,)]
 
     # when
@@ -913,8 +772,13 @@ def test_run_sink_when_sink_is_disabled_by_configuration() -> None:
     ), "Expected disable sink status to be returned"
 
 
+@mock.patch.object(v1, "run_in_parallel")
 @mock.patch.object(v1, "execute_registration", MagicMock())
-def test_run_sink_when_registration_should_happen_in_background_tasks() -> None:
+def test_run_sink_when_registration_should_happen_in_background_tasks(
+    run_in_parallel_mock: MagicMock,
+    image: WorkflowImageData,
+    prediction: dict,
+) -> None:
     # given
     background_tasks = BackgroundTasks()
     data_collector_block = RoboflowDatasetUploadBlockV1(
@@ -923,17 +787,6 @@ def test_run_sink_when_registration_should_happen_in_background_tasks() -> None:
         background_tasks=background_tasks,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
-    prediction = {
-        "top": "car",
-        "predictions": [
-            {"class": "car", "confidence": 0.7},
-            {"class": "truck", "confidence": 0.3},
-        ],
-    }
     indices = [(0,), (1,), (2,)]
 
     # when
@@ -968,11 +821,17 @@ def test_run_sink_when_registration_should_happen_in_background_tasks() -> None:
         ]
         * 3
     ), "Expected async execution status to be presented"
-    assert len(background_tasks.tasks) == 3, "Async tasks to be added"
+    assert (
+        len(background_tasks.tasks) == 1
+    ), "Expected single async task to be added for the same datapoint repeated in batch"
+    run_in_parallel_mock.assert_not_called()
 
 
 @mock.patch.object(v1, "execute_registration", MagicMock())
-def test_run_sink_when_registration_should_happen_in_thread_pool() -> None:
+def test_run_sink_when_registration_should_happen_in_thread_pool(
+    image: WorkflowImageData,
+    prediction: dict,
+) -> None:
     # given
     with ThreadPoolExecutor() as thread_pool_executor:
         data_collector_block = RoboflowDatasetUploadBlockV1(
@@ -981,17 +840,6 @@ def test_run_sink_when_registration_should_happen_in_thread_pool() -> None:
             background_tasks=None,
             thread_pool_executor=thread_pool_executor,
         )
-        image = WorkflowImageData(
-            parent_metadata=ImageParentMetadata(parent_id="parent"),
-            numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-        )
-        prediction = {
-            "top": "car",
-            "predictions": [
-                {"class": "car", "confidence": 0.7},
-                {"class": "truck", "confidence": 0.3},
-            ],
-        }
         indices = [(0,), (1,), (2,)]
 
         # when
@@ -1031,6 +879,8 @@ def test_run_sink_when_registration_should_happen_in_thread_pool() -> None:
 @mock.patch.object(v1, "execute_registration")
 def test_run_sink_when_registration_should_happen_in_foreground_despite_providing_background_tasks(
     execute_registration_mock: MagicMock,
+    image: WorkflowImageData,
+    prediction: dict,
 ) -> None:
     # given
     background_tasks = BackgroundTasks()
@@ -1041,17 +891,6 @@ def test_run_sink_when_registration_should_happen_in_foreground_despite_providin
         background_tasks=background_tasks,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
-    prediction = {
-        "top": "car",
-        "predictions": [
-            {"class": "car", "confidence": 0.7},
-            {"class": "truck", "confidence": 0.3},
-        ],
-    }
     execute_registration_mock.return_value = False, "OK"
     indices = [(0,), (1,), (2,)]
 
@@ -1087,27 +926,22 @@ def test_run_sink_when_registration_should_happen_in_foreground_despite_providin
         ]
         * 3
     ), "Expected sync execution status to be presented"
-    execute_registration_mock.assert_has_calls(
-        [
-            call(
-                image=image,
-                prediction=prediction,
-                target_project="my_project",
-                usage_quota_name="my_quota",
-                persist_predictions=True,
-                minutely_usage_limit=10,
-                hourly_usage_limit=100,
-                daily_usage_limit=1000,
-                max_image_size=(128, 128),
-                compression_level=75,
-                registration_tags=["some"],
-                labeling_batch_prefix="my_batch",
-                new_labeling_batch_frequency="never",
-                cache=cache,
-                api_key="my_api_key",
-            )
-        ]
-        * 3
+    execute_registration_mock.assert_called_once_with(
+        image=image,
+        prediction=prediction,
+        target_project="my_project",
+        usage_quota_name="my_quota",
+        persist_predictions=True,
+        minutely_usage_limit=10,
+        hourly_usage_limit=100,
+        daily_usage_limit=1000,
+        max_image_size=(128, 128),
+        compression_level=75,
+        registration_tags=["some"],
+        labeling_batch_prefix="my_batch",
+        new_labeling_batch_frequency="never",
+        cache=cache,
+        api_key="my_api_key",
     )
     assert len(background_tasks.tasks) == 0, "Async tasks not to be added"
 
@@ -1115,6 +949,7 @@ def test_run_sink_when_registration_should_happen_in_foreground_despite_providin
 @mock.patch.object(v1, "execute_registration")
 def test_run_sink_when_predictions_not_provided(
     execute_registration_mock: MagicMock,
+    image: WorkflowImageData,
 ) -> None:
     # given
     background_tasks = BackgroundTasks()
@@ -1125,10 +960,6 @@ def test_run_sink_when_predictions_not_provided(
         background_tasks=background_tasks,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
     execute_registration_mock.return_value = False, "OK"
     indices = [(0,), (1,), (2,)]
 
@@ -1162,26 +993,76 @@ def test_run_sink_when_predictions_not_provided(
         ]
         * 3
     ), "Expected sync execution status to be presented"
-    execute_registration_mock.assert_has_calls(
-        [
-            call(
-                image=image,
-                prediction=None,
-                target_project="my_project",
-                usage_quota_name="my_quota",
-                persist_predictions=True,
-                minutely_usage_limit=10,
-                hourly_usage_limit=100,
-                daily_usage_limit=1000,
-                max_image_size=(128, 128),
-                compression_level=75,
-                registration_tags=["some"],
-                labeling_batch_prefix="my_batch",
-                new_labeling_batch_frequency="never",
-                cache=cache,
-                api_key="my_api_key",
-            )
-        ]
-        * 3
+    execute_registration_mock.assert_called_once_with(
+        image=image,
+        prediction=None,
+        target_project="my_project",
+        usage_quota_name="my_quota",
+        persist_predictions=True,
+        minutely_usage_limit=10,
+        hourly_usage_limit=100,
+        daily_usage_limit=1000,
+        max_image_size=(128, 128),
+        compression_level=75,
+        registration_tags=["some"],
+        labeling_batch_prefix="my_batch",
+        new_labeling_batch_frequency="never",
+        cache=cache,
+        api_key="my_api_key",
     )
     assert len(background_tasks.tasks) == 0, "Async tasks not to be added"
+
+
+@mock.patch.object(v1, "execute_registration")
+def test_run_sink_when_batch_contains_distinct_datapoints(
+    execute_registration_mock: MagicMock,
+    prediction: dict,
+) -> None:
+    # given
+    data_collector_block = RoboflowDatasetUploadBlockV1(
+        cache=MemoryCache(),
+        api_key="my_api_key",
+        background_tasks=None,
+        thread_pool_executor=None,
+    )
+    execute_registration_mock.return_value = False, "OK"
+    images = [
+        WorkflowImageData(
+            parent_metadata=ImageParentMetadata(parent_id=f"parent_{i}"),
+            numpy_image=np.zeros((16, 16, 3), dtype=np.uint8),
+        )
+        for i in range(3)
+    ]
+    indices = [(0,), (1,), (2,)]
+
+    # when
+    result = data_collector_block.run(
+        images=Batch(content=images, indices=indices),
+        predictions=Batch(
+            content=[prediction, prediction, prediction], indices=indices
+        ),
+        target_project="my_project",
+        usage_quota_name="my_quota",
+        persist_predictions=True,
+        minutely_usage_limit=10,
+        hourly_usage_limit=100,
+        daily_usage_limit=1000,
+        max_image_size=(128, 128),
+        compression_level=75,
+        registration_tags=["some"],
+        disable_sink=False,
+        fire_and_forget=False,
+        labeling_batch_prefix="my_batch",
+        labeling_batches_recreation_frequency="never",
+    )
+
+    # then
+    assert (
+        result == [{"error_status": False, "message": "OK"}] * 3
+    ), "Expected sync execution status to be presented"
+    assert (
+        execute_registration_mock.call_count == 3
+    ), "Expected each distinct image to be registered"
+    assert {
+        id(c.kwargs["image"]) for c in execute_registration_mock.call_args_list
+    } == {id(image) for image in images}, "Expected all images to be registered"
@@ -2,7 +2,6 @@ from typing import Optional, Union
 from unittest import mock
 from unittest.mock import MagicMock
 
-import numpy as np
 import pytest
 from fastapi import BackgroundTasks
 from pydantic import ValidationError
@@ -16,7 +15,6 @@ from inference.core.workflows.core_steps.sinks.roboflow.dataset_upload.v2 import
 )
 from inference.core.workflows.execution_engine.entities.base import (
     Batch,
-    ImageParentMetadata,
     WorkflowImageData,
 )
 
@@ -269,6 +267,7 @@ def test_manifest_parsing_when_data_percentage_invalid(data_percentage: float) -
 @mock.patch.object(v2, "register_datapoint_at_roboflow")
 def test_run_sink_when_data_sampled_off(
     register_datapoint_at_roboflow_mock: MagicMock,
+    image: WorkflowImageData,
 ) -> None:
     # given
     background_tasks = BackgroundTasks()
@@ -279,10 +278,6 @@ def test_run_sink_when_data_sampled_off(
         background_tasks=background_tasks,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
     register_datapoint_at_roboflow_mock.return_value = False, "OK"
     indices = [(0,), (1,), (2,)]
 
@@ -323,6 +318,7 @@ def test_run_sink_when_data_sampled_off(
 @mock.patch.object(v2, "register_datapoint_at_roboflow")
 def test_run_sink_when_data_sampled(
     register_datapoint_at_roboflow_mock: MagicMock,
+    image: WorkflowImageData,
 ) -> None:
     # given
     background_tasks = BackgroundTasks()
@@ -333,10 +329,6 @@ def test_run_sink_when_data_sampled(
         background_tasks=background_tasks,
         thread_pool_executor=None,
     )
-    image = WorkflowImageData(
-        parent_metadata=ImageParentMetadata(parent_id="parent"),
-        numpy_image=np.zeros((512, 256, 3), dtype=np.uint8),
-    )
     register_datapoint_at_roboflow_mock.return_value = False, "OK"
     indices = [(0,), (1,), (2,)]
 
@@ -15,11 +15,15 @@ from inference.core.workflows.core_steps.sinks.roboflow.custom_metadata.v1 impor
 )
 
 
+def _get_workspace_name_cache_key(api_key: str) -> str:
+    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
+    return f"workflows:api_key_to_workspace:{api_key_hash}"
+
+
 def test_get_workspace_name_when_cache_contains_workspace_name() -> None:
     # given
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache = MemoryCache()
     cache.set(key=expected_cache_key, value="my_workspace")
 
@@ -41,8 +45,7 @@ def test_get_workspace_name_when_cache_does_not_contain_workspace_name(
     # given
     api_key = "my_api_key"
     cache = MemoryCache()
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     get_roboflow_workspace_mock.return_value = "workspace_from_api"
 
     # when
@@ -67,8 +70,7 @@ def test_add_custom_metadata_request_success(
     add_custom_metadata_mock.return_value = True
     cache = MemoryCache()
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache.set(key=expected_cache_key, value="my_workspace")
     inference_ids = np.array(["id1", "id2"])
     field_name = "location"
@@ -103,8 +105,7 @@ def test_add_custom_metadata_request_failure(
     add_custom_metadata_mock.side_effect = Exception("API error")
     cache = MemoryCache()
     api_key = "my_api_key"
-    api_key_hash = hashlib.md5(api_key.encode("utf-8")).hexdigest()
-    expected_cache_key = f"workflows:api_key_to_workspace:{api_key_hash}"
+    expected_cache_key = _get_workspace_name_cache_key(api_key=api_key)
     cache.set(key=expected_cache_key, value="my_workspace")
     inference_ids = ["id1", "id2"]
     field_name = "location"
@@ -1,9 +1,12 @@
 import numpy as np
 
 from inference.core.workflows.core_steps.transformations.absolute_static_crop.v1 import (
+    AbsoluteStaticCropBlockV1,
+    calculate_crop_bounds,
     take_static_crop,
 )
 from inference.core.workflows.execution_engine.entities.base import (
+    Batch,
     ImageParentMetadata,
     OriginCoordinatesSystem,
     WorkflowImageData,
@@ -71,3 +74,109 @@ def test_take_absolute_static_crop_when_output_crop_is_empty() -> None:
 
     # then
     assert result is None, "Expected no crop as result"
+
+
+def test_take_absolute_static_crop_when_crop_exceeds_image_boundaries() -> None:
+    # given
+    np_image = np.zeros((100, 100, 3), dtype=np.uint8)
+    np_image[0:10, 0:5] = 30  # painted the visible part of crop into (30, 30, 30)
+    image = WorkflowImageData(
+        parent_metadata=ImageParentMetadata(parent_id="origin_image"),
+        numpy_image=np_image,
+    )
+
+    # when
+    result = take_static_crop(
+        image=image,
+        x_center=0,
+        y_center=0,
+        width=10,
+        height=20,
+    )
+
+    # then
+    assert (
+        result.numpy_image == (np.ones((10, 5, 3), dtype=np.uint8) * 30)
+    ).all(), "Crop must be clipped to the image boundaries"
+    assert result.parent_metadata.origin_coordinates == OriginCoordinatesSystem(
+        left_top_x=0,
+        left_top_y=0,
+        origin_width=100,
+        origin_height=100,
+    ), "Origin coordinates must point to the clipped crop"
+
+
+def test_take_absolute_static_crop_when_crop_lies_entirely_outside_image() -> None:
+    # given
+    np_image = np.zeros((100, 100, 3), dtype=np.uint8)
+    image = WorkflowImageData(
+        parent_metadata=ImageParentMetadata(parent_id="origin_image"),
+        numpy_image=np_image,
+    )
+
+    # when
+    result = take_static_crop(
+        image=image,
+        x_center=-100,
+        y_center=50,
+        width=10,
+        height=10,
+    )
+
+    # then
+    assert result is None, "Expected no crop when window lies left of the image"
+
+
+def test_calculate_crop_bounds_when_crop_exceeds_image_boundaries() -> None:
+    # when
+    result = calculate_crop_bounds(
+        x_center=95,
+        y_center=5,
+        width=20,
+        height=20,
+        image_height=100,
+        image_width=100,
+    )
+
+    # then
+    assert result == (85, 0, 100, 15), "Bounds must be clipped to the image"
+
+
+def test_calculate_crop_bounds_when_crop_lies_above_image() -> None:
+    # when
+    result = calculate_crop_bounds(
+        x_center=50,
+        y_center=-100,
+        width=10,
+        height=10,
+        image_height=100,
+        image_width=100,
+    )
+
+    # then
+    assert result == (45, 0, 55, 0), "Bounds must not wrap around to the image end"
+
+
+def test_absolute_static_crop_block_assigns_unique_parent_ids_to_crops() -> None:
+    # given
+    images = Batch(
+        content=[
+            WorkflowImageData(
+                parent_metadata=ImageParentMetadata(parent_id=f"origin_image_{i}"),
+                numpy_image=np.zeros((100, 100, 3), dtype=np.uint8),
+            )
+            for i in range(3)
+        ],
+        indices=[(0,), (1,), (2,)],
+    )
+    block = AbsoluteStaticCropBlockV1()
+
+    # when
+    result = block.run(images=images, x_center=50, y_center=50, width=10, height=10)
+
+    # then
+    parent_ids = [r["crops"].parent_metadata.parent_id for r in result]
+    assert len(set(parent_ids)) == 3, "Each crop must be assigned unique parent id"
+    assert all(
+        parent_id.startswith("absolute_static_crop.") for parent_id in parent_ids
+    ), "Parent must be set at crop step identifier"